@@ -0,0 +1,176 @@
+"""
+Runs full LateAlert / LongRides / BatteriesAlert cycles against the local
+fake API (benchmarks/fake_api.py), sweeping fleet size, late-ride count and
+simulated network latency. Reports p50/p95 cycle time, HTTP calls, bytes
+transferred and peak memory, and saves the results as JSON.
+
+    python -m benchmarks.bench_alert_cycles --cars 500,2000,5000 --late 10,100 --latency 0,0.1 --output cycles.json
+
+Every cycle starts cold (new alerts, empty comment cache and data hub) unless
+--warm is given, in which case alerts and caches live across cycles as in the app.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+
+from benchmarks.fake_api import FakeApi, FakeApiServer, FaultConfig, generated_fleets
+
+
+def percentile(values: list[float], pct: int) -> float:
+    if len(values) < 2:
+        return values[0]
+    return statistics.quantiles(values, n=100, method='inclusive')[pct - 1]
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+class CycleRunner:
+    """ Builds the three alerts the way WebAutomationWorker does and runs one cycle of them """
+
+    def __init__(self, server: FakeApiServer, pointer_latency: float, warm: bool):
+        # Imported here so settings picks up the fake API URLs set in main().
+        import settings
+        from src.autotel import BatteriesAlert, LongRides
+        from src.goto import LateAlert
+        from src.shared import BaseAlert, deadline
+        from src.shared.data_hub import DataHub
+        from src.shared.token_manager import XTokenManager
+
+        self.settings, self.deadline, self.BaseAlert = settings, deadline, BaseAlert
+        self.alert_types = (LateAlert, LongRides, BatteriesAlert)
+        self.DataHub, self.XTokenManager = DataHub, XTokenManager
+        self.server = server
+        self.pointer_latency = pointer_latency
+        self.warm = warm
+        self.rows = {}
+        self.alerts = None
+
+    async def fetch_token(self, service: str) -> str:
+        from src.shared import http_client
+        response = await http_client.get_pool().post(f"{self.server.url}/token")
+        return response.json()['token']
+
+    async def pointer(self, car_licenses: list[str]) -> dict[str, str]:
+        if self.pointer_latency:
+            await asyncio.sleep(self.pointer_latency)
+        return {car_license: "Bench Location" for car_license in car_licenses}
+
+    def build_alerts(self):
+        hub = self.DataHub(self.XTokenManager(self.fetch_token))
+        alerts = []
+        for alert_type in self.alert_types:
+            name = alert_type.__name__
+            kwargs = dict(
+                show_toast=lambda *args: None,
+                gui_table_row=lambda delta, name=name: self.rows.__setitem__(name, len(delta.rows)),
+                open_ride=None,
+                hub=hub,
+            )
+            if alert_type.__name__ != 'LateAlert':
+                kwargs['pointer'] = self.pointer
+            alerts.append(alert_type(**kwargs))
+        return alerts
+
+    async def run_cycle(self):
+        if self.alerts is None or not self.warm:
+            self.alerts = self.build_alerts()
+            self.BaseAlert.comment_cache.clear()
+        with self.deadline.cycle_deadline(self.settings.cycle_deadline):
+            await asyncio.gather(*(alert.start_requests() for alert in self.alerts))
+
+
+async def measure(runner: CycleRunner, api: FakeApi, cycles: int) -> dict:
+    from src.shared import http_client
+
+    timings, calls, transferred = [], [], []
+    for _ in range(cycles):
+        requests, sent = api.stats['requests'], api.stats['bytes_sent']
+        started = time.perf_counter()
+        await runner.run_cycle()
+        timings.append(time.perf_counter() - started)
+        calls.append(api.stats['requests'] - requests)
+        transferred.append(api.stats['bytes_sent'] - sent)
+
+    tracemalloc.start()
+    await runner.run_cycle()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    await http_client.close_pool()
+
+    return {
+        'p50_ms': round(percentile(timings, 50) * 1000, 2),
+        'p95_ms': round(percentile(timings, 95) * 1000, 2),
+        'http_calls': round(statistics.mean(calls), 1),
+        'bytes': round(statistics.mean(transferred)),
+        'peak_memory_kib': round(peak / 1024),
+        'rows': dict(runner.rows),
+    }
+
+
+def parse_list(value: str, cast=int) -> list:
+    return [cast(item) for item in value.split(',') if item]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cars', type=parse_list, default=[500, 2000, 5000])
+    parser.add_argument('--late', type=parse_list, default=[10, 100])
+    parser.add_argument('--long', type=int, default=20)
+    parser.add_argument('--latency', type=lambda value: parse_list(value, float), default=[0.0, 0.1])
+    parser.add_argument('--pointer-latency', type=float, default=0.0)
+    parser.add_argument('--cycles', type=int, default=5)
+    parser.add_argument('--warm', action='store_true')
+    parser.add_argument('--no-rate-limit', action='store_true', help='lift the per-host API rate limits')
+    parser.add_argument('--rate-limit', metavar='RATE/BURST/IN_FLIGHT',
+                        help='per-host API limits to use instead of settings, e.g. 50/100/16')
+    parser.add_argument('--output', default='alert_cycles.json')
+    args = parser.parse_args()
+
+    api = FakeApi()
+    with FakeApiServer(api) as server:
+        os.environ['GOTO_API_URL'] = server.service_url('goto')
+        os.environ['AUTOTEL_API_URL'] = server.service_url('autotel')
+        if args.no_rate_limit or args.rate_limit:
+            import settings
+            rate, burst, in_flight = map(float, (args.rate_limit or '10000/10000/256').split('/'))
+            settings.api_rate_limit_default = {'rate': rate, 'burst': int(burst), 'max_in_flight': int(in_flight)}
+
+        results = []
+        for cars, late, latency in itertools.product(args.cars, args.late, args.latency):
+            api.fleets = generated_fleets(cars, late, args.long)
+            api.faults = FaultConfig(latency=latency)
+            runner = CycleRunner(server, args.pointer_latency, args.warm)
+            result = {'cars': cars, 'late': late, 'long': args.long, 'latency': latency,
+                      **asyncio.run(measure(runner, api, args.cycles))}
+            results.append(result)
+            print(f"cars={cars:<6} late={late:<5} latency={latency:<5} "
+                  f"p50 {result['p50_ms']:9.1f} ms  p95 {result['p95_ms']:9.1f} ms  "
+                  f"calls {result['http_calls']:6}  bytes {result['bytes']:>10}  peak {result['peak_memory_kib']:>7} KiB")
+
+    with open(args.output, 'w', encoding='utf-8') as file:
+        json.dump({
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'cycles': args.cycles,
+            'warm': args.warm,
+            'pointer_latency': args.pointer_latency,
+            'rate_limit': 'none' if args.no_rate_limit else args.rate_limit,
+            'results': results,
+        }, file, indent=2)
+    print(f"Saved {len(results)} results to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
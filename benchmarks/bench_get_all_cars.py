@@ -0,0 +1,51 @@
+"""
+Compares decoding a GetAllCars `Data` payload with stdlib json.loads + filter
+against decoding.decode_active_electric_cars, which filters and projects to
+Car records in one pass using the fastest installed JSON backend (orjson).
+
+    python -m benchmarks.bench_get_all_cars --cars 5000
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+from src.shared import decoding
+from src.shared.decoding import decode_active_electric_cars
+from benchmarks.fleet import generate_cars
+
+
+def decode_full(data: str) -> list[dict]:
+    cars = json.loads(data)
+    return [car for car in cars if car.get('activeReservationNum') and car.get('categoryId') == 1]
+
+
+def measure(func, data: str, repeat: int) -> tuple[float, int, int]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(data)
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    result = func(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(timings), peak, len(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--cars', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    data = json.dumps(generate_cars(args.cars))
+    print(f"Payload: {args.cars} cars, {len(data) / 1024:.0f} KiB, JSON backend: {decoding.loads.__module__}")
+    for name, func in (('json.loads + filter', decode_full), ('decode_active_electric_cars', decode_active_electric_cars)):
+        best, peak, kept = measure(func, data, args.repeat)
+        print(f"{name:<28} {best * 1000:8.2f} ms  peak {peak / 1024:8.0f} KiB  kept {kept}")
+
+
+if __name__ == '__main__':
+    main()
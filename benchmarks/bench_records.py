@@ -0,0 +1,65 @@
+"""
+Compares decoding and processing reservation payloads as raw dicts
+(json.loads + utils.parse_time per field, as the alerts used to) against
+the typed records in src.shared.records.
+
+    python -m benchmarks.bench_records --reservations 2000
+"""
+import argparse
+import json
+import time
+from datetime import datetime as dt, timedelta
+
+from src.shared import decoding, utils
+from benchmarks.fleet import generate_cars, generate_reservations
+
+
+def process_dicts(data: str) -> tuple[int, int]:
+    now = dt.now()
+    late = long = 0
+    for ride in json.loads(data):
+        end_date = utils.parse_time(ride.get('endDate', ''))
+        if end_date and end_date <= now:
+            late += 1
+        start_date = utils.parse_time(ride.get('actualStartDate', ''))
+        if start_date and now - start_date >= timedelta(hours=3):
+            long += 1
+    return late, long
+
+
+def process_records(data: str) -> tuple[int, int]:
+    now = dt.now()
+    late = long = 0
+    for ride in decoding.decode_reservations(data):
+        if ride.end_date and ride.end_date <= now:
+            late += 1
+        if ride.actual_start_date and now - ride.actual_start_date >= timedelta(hours=3):
+            long += 1
+    return late, long
+
+
+def best_of(func, data: str, repeat: int) -> tuple[float, tuple]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(data)
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--reservations', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    cars = generate_cars(args.reservations, active_ratio=1.0)
+    data = json.dumps(generate_reservations(cars, late_count=args.reservations // 10, long_count=args.reservations // 10))
+    print(f"Payload: {args.reservations} reservations, JSON backend: {decoding.loads.__module__}")
+    for name, func in (('dicts + parse_time', process_dicts), ('typed records', process_records)):
+        best, (late, long) = best_of(func, data, args.repeat)
+        print(f"{name:<20} {best * 1000:8.2f} ms  late {late}  long {long}")
+
+
+if __name__ == '__main__':
+    main()
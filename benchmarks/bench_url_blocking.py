@@ -0,0 +1,109 @@
+"""
+Compares page load times with the request blocking strategies of AsyncWebAccess:
+
+    none     no blocking
+    route    the old context.route("**/*") handler: every request round-trips into Python
+    browser  Network.setBlockedURLs via CDP plus a route limited to the blocked
+             patterns (the current AsyncWebAccess behaviour)
+
+A local server serves a page with --assets assets, --blocked of which match
+the block list, each delayed by --latency seconds.
+
+    python -m benchmarks.bench_url_blocking --assets 200 --blocked 20 --loads 20
+"""
+import argparse
+import asyncio
+import statistics
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from services import AsyncWebAccess
+
+
+def make_handler(assets: int, blocked: int, latency: float):
+    tags = [f'<script src="/asset/{i}.js"></script>' for i in range(assets - blocked)]
+    tags += [f'<img src="/blocked/{i}.gif">' for i in range(blocked)]
+    page = f"<html><head>{''.join(tags)}</head><body>bench</body></html>".encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            if self.path.startswith('/page'):
+                return self._send(page, 'text/html')
+            if latency:
+                time.sleep(latency)
+            self._send(b'' if self.path.startswith('/blocked/') else b'void 0;', 'application/javascript')
+
+        def _send(self, body: bytes, content_type: str):
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('Cache-Control', 'no-store')
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+async def route_blocking(context, patterns: list[str]):
+    """ The handler AsyncWebAccess used before blocking moved into the browser """
+    substrings_to_block = [pattern.strip('*') for pattern in patterns]
+
+    async def handle_route(route, request):
+        url = urllib.parse.unquote(request.url)
+        if any(substr in url for substr in substrings_to_block):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    await context.route("**/*", handle_route)
+
+
+async def measure(mode: str, url: str, patterns: list[str], loads: int) -> list[float]:
+    blocked_urls = patterns if mode == 'browser' else ()
+    async with AsyncWebAccess(headless=True, profile=None, blocked_urls=blocked_urls) as web:
+        if mode == 'route':
+            await route_blocking(web.context, patterns)
+        page = await web.create_new_page('bench', 'about:blank', wait_until='load')
+        timings = []
+        for i in range(loads + 1):
+            started = time.perf_counter()
+            await page.goto(f"{url}/page?{i}", wait_until='load')
+            timings.append(time.perf_counter() - started)
+        return timings[1:]  # the first load warms up the browser
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--assets', type=int, default=200)
+    parser.add_argument('--blocked', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--loads', type=int, default=20)
+    parser.add_argument('--modes', default='none,route,browser')
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(args.assets, args.blocked, args.latency))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    patterns = [f"{url}/blocked/*"]
+
+    try:
+        for mode in args.modes.split(','):
+            timings = asyncio.run(measure(mode, url, patterns, args.loads))
+            p95 = statistics.quantiles(timings, n=100, method='inclusive')[94] if len(timings) > 1 else timings[0]
+            print(f"{mode:<8} p50 {statistics.median(timings) * 1000:8.1f} ms  p95 {p95 * 1000:8.1f} ms  "
+                  f"({args.assets} assets, {args.blocked} blocked, {args.loads} loads)")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
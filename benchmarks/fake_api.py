@@ -0,0 +1,261 @@
+"""
+Local stand-in for the Goto/Autotel public APIs, serving generated fleets.
+
+Implements getCurrentReservations, GetFutureReservations, GetReservation and
+GetAllCars for both services, under /goto/API/SEND and /autotel/API/SEND.
+Point the app at it with:
+
+    python -m benchmarks.fake_api --cars 5000 --late 40 --latency 0.15
+    GOTO_API_URL=http://127.0.0.1:8765/goto AUTOTEL_API_URL=http://127.0.0.1:8765/autotel python main.py
+
+--record FILE proxies to the real APIs (forwarding the X-Token) and saves
+every response; --replay FILE serves the saved responses instead of a fleet.
+Latency, server errors and token expiry (401 once a token is older than
+--token-ttl) can be injected in every mode. POST /token hands out a fresh token.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.fleet import generate_cars, generate_reservations, generate_future_reservations
+
+UPSTREAM = {
+    'goto': 'https://car2gopublicapi.gototech.co',
+    'autotel': 'https://autotelpublicapiprod.gototech.co',
+}
+
+
+@dataclass
+class FaultConfig:
+    latency: float = 0.0        # seconds added to every response
+    jitter: float = 0.0         # +/- seconds of random latency
+    error_rate: float = 0.0     # share of requests answered with a 500
+    token_ttl: float | None = None  # seconds a token is accepted, None for forever
+
+
+class Fleet:
+    """ Pre-serialised API payloads for one service's generated fleet """
+
+    def __init__(self, cars: int, late: int, long: int, seed: int):
+        car_records = generate_cars(cars, seed=seed)
+        reservations = generate_reservations(car_records, seed=seed, late_count=late, long_count=long)
+        self.reservations = {str(ride['id']): ride for ride in reservations}
+        self.payloads = {
+            'getcurrentreservations': json.dumps(reservations, ensure_ascii=False),
+            'getfuturereservations': json.dumps(generate_future_reservations(car_records, seed=seed), ensure_ascii=False),
+            'getallcars': json.dumps(car_records, ensure_ascii=False),
+        }
+
+    def data(self, opcode: str, data: str) -> str | None:
+        if opcode == 'getreservation':
+            ride = self.reservations.get(data.strip('/'))
+            return json.dumps(ride, ensure_ascii=False) if ride else None
+        return self.payloads.get(opcode)
+
+
+class FakeApi:
+    """
+    The request handling behind the server: routes (service, opcode, Data)
+    to a fleet, a recording or the real API, and injects faults.
+    """
+
+    def __init__(self, fleets: dict[str, Fleet] | None = None, faults: FaultConfig | None = None,
+                 replay: dict | None = None, record_to: str | None = None):
+        self.fleets = fleets or {}
+        self.faults = faults or FaultConfig()
+        self.recording = replay if replay is not None else {}
+        self.replaying = replay is not None
+        self.record_to = record_to
+        self._tokens: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'bytes_sent': 0, 'errors': 0, 'expired_tokens': 0}
+
+    def issue_token(self) -> str:
+        token = uuid.uuid4().hex
+        with self._lock:
+            self._tokens[token] = time.monotonic()
+        return token
+
+    def token_expired(self, token: str) -> bool:
+        if self.faults.token_ttl is None:
+            return False
+        with self._lock:
+            issued = self._tokens.setdefault(token, time.monotonic())
+        return time.monotonic() - issued > self.faults.token_ttl
+
+    def handle(self, service: str, path: str, token: str, payload: dict) -> tuple[int, bytes]:
+        with self._lock:
+            self.stats['requests'] += 1
+        delay = self.faults.latency + random.uniform(-self.faults.jitter, self.faults.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+        if self.token_expired(token):
+            with self._lock:
+                self.stats['expired_tokens'] += 1
+            return 401, b''
+        if random.random() < self.faults.error_rate:
+            with self._lock:
+                self.stats['errors'] += 1
+            return 500, b'{"Message": "Injected error"}'
+
+        opcode = str(payload.get('Opcode', '')).lower()
+        data = str(payload.get('Data') or '')
+        key = f"{service} {opcode} {data}"
+        if self.replaying or self.record_to is None:
+            body = self.recording.get(key) if self.replaying else self._from_fleet(service, opcode, data)
+            status = 200 if body is not None else 404
+            body = (body or '').encode()
+        else:
+            status, body = self._forward(service, path, token, payload)
+            if status == 200:
+                with self._lock:
+                    self.recording[key] = body.decode()
+                    self.save()
+
+        with self._lock:
+            self.stats['bytes_sent'] += len(body)
+        return status, body
+
+    def _from_fleet(self, service: str, opcode: str, data: str) -> str | None:
+        fleet = self.fleets.get(service)
+        result = fleet.data(opcode, data) if fleet else None
+        return json.dumps({'Data': result}, ensure_ascii=False) if result is not None else None
+
+    def _forward(self, service: str, path: str, token: str, payload: dict) -> tuple[int, bytes]:
+        request = urllib.request.Request(
+            UPSTREAM[service] + path,
+            data=json.dumps(payload).encode(),
+            headers={'Content-Type': 'application/json', 'Accept': 'application/json', 'X-Token': token},
+            method='POST',
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.read()
+
+    def save(self):
+        with open(self.record_to, 'w', encoding='utf-8') as file:
+            json.dump(self.recording, file, ensure_ascii=False)
+
+
+def make_handler(api: FakeApi):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            body = self.rfile.read(length)
+            if self.path == '/token':
+                return self._send(200, json.dumps({'token': api.issue_token()}).encode())
+
+            service, _, path = self.path.lstrip('/').partition('/')
+            if service not in UPSTREAM or not path.startswith('API/SEND'):
+                return self._send(404, b'')
+            try:
+                payload = json.loads(body or b'{}')
+            except ValueError:
+                return self._send(400, b'')
+            status, response = api.handle(service, '/' + path, self.headers.get('X-Token', ''), payload)
+            self._send(status, response)
+
+        def _send(self, status: int, body: bytes):
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+class FakeApiServer:
+    """ Runs a FakeApi on a background thread; port 0 picks a free port """
+
+    def __init__(self, api: FakeApi, host: str = '127.0.0.1', port: int = 0):
+        self.api = api
+        self.server = ThreadingHTTPServer((host, port), make_handler(api))
+        self.server.daemon_threads = True
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def service_url(self, service: str) -> str:
+        """ Base URL to use as GOTO_API_URL / AUTOTEL_API_URL """
+        return f"{self.url}/{service}"
+
+    def start(self) -> 'FakeApiServer':
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def generated_fleets(cars: int, late: int, long: int, seed: int = 0) -> dict[str, Fleet]:
+    return {
+        'goto': Fleet(cars, late, long, seed),
+        'autotel': Fleet(cars, late, long, seed + 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--cars', type=int, default=1000)
+    parser.add_argument('--late', type=int, default=20)
+    parser.add_argument('--long', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--token-ttl', type=float, default=None)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--record', metavar='FILE', help='proxy to the real APIs and save responses to FILE')
+    mode.add_argument('--replay', metavar='FILE', help='serve responses saved with --record')
+    args = parser.parse_args()
+
+    faults = FaultConfig(args.latency, args.jitter, args.error_rate, args.token_ttl)
+    if args.replay:
+        with open(args.replay, encoding='utf-8') as file:
+            api = FakeApi(faults=faults, replay=json.load(file))
+    elif args.record:
+        api = FakeApi(faults=faults, record_to=args.record)
+    else:
+        api = FakeApi(generated_fleets(args.cars, args.late, args.long, args.seed), faults)
+
+    server = FakeApiServer(api, port=args.port)
+    print(f"Fake API listening on {server.url}")
+    print(f"  GOTO_API_URL={server.service_url('goto')} AUTOTEL_API_URL={server.service_url('autotel')}")
+    try:
+        server.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server.server_close()
+        print(f"Served: {api.stats}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Synthetic Goto/Autotel fleet data shaped like the public API payloads.
+"""
+import random
+from datetime import datetime as dt, timedelta
+
+CITIES = ['תל אביב', 'ירושלים', 'חיפה', 'רמת גן', 'הרצליה', 'פתח תקווה']
+
+
+def licence_plate(rng: random.Random) -> str:
+    return f"{rng.randint(100, 999)}-{rng.randint(10, 99)}-{rng.randint(100, 999)}"
+
+
+def api_time(value: dt) -> str:
+    return value.strftime("%Y-%m-%dT%H:%M:%S.") + f"{value.microsecond // 1000:03d}"
+
+
+def generate_cars(size: int, seed: int = 0, active_ratio: float = 0.3, electric_ratio: float = 0.4) -> list[dict]:
+    """GetAllCars-style car records."""
+    rng = random.Random(seed)
+    cars = []
+    for car_id in range(1, size + 1):
+        electric = rng.random() < electric_ratio
+        active = rng.random() < active_ratio
+        cars.append({
+            'id': car_id,
+            'licencePlate': licence_plate(rng),
+            'carNickName': f"Car {car_id}",
+            'categoryId': 1 if electric else rng.choice([2, 3, 4]),
+            'categoryName': 'Electric' if electric else 'Fuel',
+            'activeReservationNum': rng.randint(1_000_000, 9_999_999) if active else None,
+            'lastFuelPercentage': rng.randint(0, 100),
+            'lastMileage': rng.randint(1_000, 200_000),
+            'latitude': 32 + rng.random(),
+            'longitude': 34.7 + rng.random() / 2,
+            'address': f"{rng.choice(CITIES)} {rng.randint(1, 200)}",
+            'parkingId': rng.randint(1, 500),
+            'statusId': rng.randint(1, 6),
+            'isAvailable': not active,
+            'lastUpdate': api_time(dt.now() - timedelta(minutes=rng.randint(0, 600))),
+            'modelName': rng.choice(['Kia Niro', 'Hyundai Ioniq', 'Skoda Fabia', 'Toyota Yaris']),
+            'comments': None,
+        })
+    return cars
+
+
+def generate_reservations(cars: list[dict], seed: int = 0, late_count: int = 0, long_count: int = 0) -> list[dict]:
+    """getCurrentReservations-style records for every car with an active reservation."""
+    rng = random.Random(seed)
+    now = dt.now()
+    reservations = []
+    for index, car in enumerate(car for car in cars if car['activeReservationNum']):
+        late = index < late_count
+        long = late_count <= index < late_count + long_count
+        start = now - timedelta(hours=rng.uniform(3.5, 8) if long else rng.uniform(0.1, 2.5))
+        end = now - timedelta(minutes=rng.randint(1, 25)) if late else now + timedelta(hours=rng.uniform(0.5, 6))
+        reservations.append({
+            'id': car['activeReservationNum'],
+            'carId': car['id'],
+            'carLicencePlate': car['licencePlate'],
+            'driverFirstName': f"Driver{index}",
+            'driverLastName': 'Test',
+            'startDate': api_time(start),
+            'actualStartDate': api_time(start),
+            'endDate': api_time(end),
+            'statusId': 2,
+            'comment': rng.choice([None, '', 'סוללה חלשה', 'Customer called']),
+        })
+    return reservations
+
+
+def generate_future_reservations(cars: list[dict], seed: int = 0, per_car: float = 0.5) -> list[dict]:
+    """GetFutureReservations-style records."""
+    rng = random.Random(seed)
+    now = dt.now()
+    future = []
+    for car in cars:
+        while rng.random() < per_car:
+            start = now + timedelta(minutes=rng.randint(10, 60 * 48))
+            future.append({
+                'id': rng.randint(1_000_000, 9_999_999),
+                'carLicencePlate': car['licencePlate'],
+                'startDate': start.strftime("%Y-%m-%dT%H:%M:%S"),
+                'endDate': (start + timedelta(hours=2)).strftime("%Y-%m-%dT%H:%M:%S"),
+            })
+    return future
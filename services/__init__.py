@@ -1,6 +1,20 @@
-from .web_access_service import AsyncWebAccess
-from . import fluent
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # also lets PyInstaller and IDEs see the modules
+    from .web_access_service import AsyncWebAccess
+    from . import fluent
+
 __all__ = [
     "AsyncWebAccess",
     "fluent"
 ]
+
+
+def __getattr__(name):
+    # Loaded on first use, so importing the package doesn't require Playwright.
+    if name == "AsyncWebAccess":
+        return importlib.import_module(".web_access_service", __name__).AsyncWebAccess
+    if name == "fluent":
+        return importlib.import_module(".fluent", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
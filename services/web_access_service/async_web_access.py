@@ -1,10 +1,11 @@
 import asyncio
 from pathlib import Path
+import re
 import subprocess
-from playwright.async_api import async_playwright, BrowserContext, Page, Playwright, Download, Error
-from typing import Optional, Literal
+import weakref
+from playwright.async_api import async_playwright, BrowserContext, CDPSession, Page, Playwright, Download, Error
+from typing import Optional, Literal, Sequence
 from pathlib import Path
-import urllib.parse
 
 class AsyncWebAccess:
     """
@@ -20,11 +21,15 @@ class AsyncWebAccess:
         headless: bool = True,
         browser_name: str = 'edge',
         profile: str = "Default",
+        blocked_urls: Sequence[str] = (),
     ):
         self._headless = headless
         self._browser_name = browser_name
         self._profile = profile or None
+        self.blocked_urls = list(blocked_urls)
         self.pages: dict[str, Page] = {}
+        # Per-page setup (downloads, URL blocking), awaited before a page's first navigation
+        self._page_setup: weakref.WeakKeyDictionary[Page, asyncio.Task] = weakref.WeakKeyDictionary()
         
     async def __aenter__(self):
         self._playwright = await async_playwright().start()
@@ -92,36 +97,36 @@ class AsyncWebAccess:
             self.context: BrowserContext | None = await self.browser.new_context()
 
         await self.add_download_event_handler()
+        await self.route_blocked_urls(self.context)
             
         self.pages: dict[str, Page] = {}
-        await self.block_unwanted_requests(self.context)
                 
         return self
     
-    async def block_unwanted_requests(self, context):
-        exact_urls_to_block = {
-            "https://car2govisibility.gototech.co/API/RT/reservationIssues",
-            "https://d15k2d11r6t6rl.cloudfront.net/public/users/Integrators/BeeProAgency/588880_570515/editor_images/7e2578ba-94b9-42ff-91e7-445b43f53d32.png",
-            "content.powerapps.com/resource/webplayerbus/hashedresources/2jc6enofp9rqe/js/webplayer-authflow.js",
-            "chrome-extension://hokifickgkhplphjiodbggjmoafhignh/fonts/fabric-icons.woff",
-            "autotel.crm4.dynamics.com/{000000520173284}/webresources/cc_MscrmControls.Grid.PCFGridControl/PCFGridControl.js",
-            "goto.crm4.dynamics.com/{638872608630000206}/webresources/cc_MscrmControls.FieldControls.TimerControl/css/TimerIcon.css",
-        }
-
-        substrings_to_block = [
-            "goto.crm4.dynamics.com/apc/100k.gif",
-            "autotel.crm4.dynamics.com/apc/100k.gif",
-            "apps.powerapps.com/apphost/e/"
-        ]
+    async def route_blocked_urls(self, context: BrowserContext):
+        """
+        Aborts requests matching self.blocked_urls in every frame of the context,
+        including out-of-process iframes (e.g. PowerApps inside the CRM) that a
+        page's own CDP session doesn't cover. Only matching requests are
+        intercepted, so allowed requests never reach Python.
+        """
+        if self.blocked_urls:
+            await context.route(blocked_urls_regex(self.blocked_urls), lambda route: route.abort())
 
-        async def handle_route(route, request):
-            url = urllib.parse.unquote(request.url)
-            if url in exact_urls_to_block or any(substr in url for substr in substrings_to_block):
-                await route.abort()
-            else:
-                await route.continue_()
+    async def block_unwanted_requests(self, page: Page, client: CDPSession | None):
+        """
+        Blocks self.blocked_urls ('*' wildcards) in the page's own target with
+        Network.setBlockedURLs, so those requests fail inside the browser
+        without a round trip. Iframes in other processes are left to route_blocked_urls.
+        """
+        if not self.blocked_urls or client is None:
+            return
+        try:
+            await client.send("Network.enable")
+            await client.send("Network.setBlockedURLs", {"urls": self.blocked_urls})
+        except Exception as e:
+            print(f"[BlockRequests] CDP blocking unavailable, relying on the context route: {e}")
 
-        await context.route("**/*", handle_route)
     async def add_download_event_handler(self):
         """
         Attach download event handlers only once per page,
@@ -139,6 +144,7 @@ class AsyncWebAccess:
         download_path = str(Path.home() / "Downloads")
 
         async def attach_listener(page: Page):
+                client = None
                 try:
                     client = await page.context.new_cdp_session(page)
                     await client.send(
@@ -150,11 +156,15 @@ class AsyncWebAccess:
                     )
                 except Exception as e:
                     print(f"[DownloadHandler] Failed to attach to page: {e}")
+                await self.block_unwanted_requests(page, client)
 
-        tasks = [asyncio.create_task(attach_listener(page)) for page in self.context.pages]
-        await asyncio.gather(*tasks)
+        def setup_page(page: Page) -> asyncio.Task:
+            task = self._page_setup[page] = asyncio.create_task(attach_listener(page))
+            return task
 
-        self.context.on("page", lambda page: asyncio.create_task(attach_listener(page)))
+        await asyncio.gather(*(setup_page(page) for page in self.context.pages))
+
+        self.context.on("page", setup_page)
 
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -212,6 +222,8 @@ class AsyncWebAccess:
         if page_name not in self.pages or self.pages[page_name].is_closed():
             page = await self.context.new_page()
             self.pages[page_name] = page
+            if setup := self._page_setup.get(page):
+                await setup
         else:
             page = self.pages[page_name]
 
@@ -256,3 +268,8 @@ class AsyncWebAccess:
                 await self._playwright.stop()
         except Exception as e:
             print(f"[WARN] Failed to close Playwright: {e}")
+
+
+def blocked_urls_regex(patterns: Sequence[str]) -> re.Pattern:
+    """ One regex matching any of the '*' wildcard URL patterns, for page.route() """
+    return re.compile('|'.join('^' + re.escape(pattern).replace(r'\*', '.*') + '$' for pattern in patterns))
@@ -1,3 +1,6 @@
+import os
+from urllib.parse import urlsplit
+
 app_icon = 'c2gFav.ico'
 autotel_icon = 'autoFav.ico'
 goto_url = 'https://car2gobo.gototech.co'
@@ -7,4 +10,87 @@ autotel_crm_url = 'https://autotel.crm4.dynamics.com'
 playwright_headless = False
 pointer_interval = 60*10
 tasks_interval = 60
-retry_count = 3
\ No newline at end of file
+retry_count = 3
+http_timeout = 15
+http_max_connections = 10
+http_max_keepalive_connections = 5
+http_keepalive_expiry = 120
+
+comment_cache_size = 1024
+comment_cache_ttl = 60*5
+
+enrichment_concurrency = 8
+enrichment_timeout = 30
+
+x_token_request_timeout = 70
+x_token_refresh_margin = 60
+
+pointer_request_timeout = 30
+# Pointer locations are cached per page reload (every pointer_interval) for at most this long.
+pointer_cache_ttl = 60*10
+
+# Per-host request limits for the public APIs: requests per second, burst size
+# and concurrent requests. They back off on 429/5xx/timeouts and recover on healthy responses.
+# A cold cycle sends one GetReservation per ride (about 270 calls for 2000 cars), so the
+# limits bound cycle time: with 100 ms latency a 2000-car cycle takes ~27 s at 10/20/8,
+# ~11 s at 25/50/8 and ~7.9 s at 50/100/16, the same as unlimited
+# (benchmarks/bench_alert_cycles.py --rate-limit). Lower them only if the APIs start
+# answering 429 at this rate, at the cost of slower cold cycles.
+api_rate_limit_default = {'rate': 50, 'burst': 100, 'max_in_flight': 16}
+api_rate_limits = {
+    'car2gopublicapi.gototech.co': {'rate': 50, 'burst': 100, 'max_in_flight': 16},
+    'autotelpublicapiprod.gototech.co': {'rate': 50, 'burst': 100, 'max_in_flight': 16},
+}
+
+# Alerts reuse their previous rows while the API payload is unchanged, for at most this long.
+unchanged_payload_max_age = 60*5
+
+# Public API base URLs. GOTO_API_URL / AUTOTEL_API_URL point the app at another
+# server, e.g. the local stand-in in benchmarks/fake_api.py.
+goto_api_url = os.environ.get('GOTO_API_URL', 'https://car2gopublicapi.gototech.co')
+autotel_api_url = os.environ.get('AUTOTEL_API_URL', 'https://autotelpublicapiprod.gototech.co')
+goto_api_host = urlsplit(goto_api_url).hostname
+autotel_api_host = urlsplit(autotel_api_url).hostname
+
+retry_base_delay = 1
+retry_max_delay = 10
+circuit_failure_threshold = 5
+circuit_reset_timeout = 30
+
+# API snapshots younger than this are shared between alerts instead of refetched.
+data_hub_max_age = 20
+
+# Per-alert schedule: seconds between runs, +/- random jitter, and what to do when
+# a run is still going when the next one is due ('skip' it, or 'coalesce' into one extra run).
+alert_schedules = {
+    'late_rides': {'interval': 30, 'jitter': 3, 'overrun': 'coalesce'},
+    'long_rides': {'interval': 60, 'jitter': 5, 'overrun': 'skip'},
+    'batteries': {'interval': 60*3, 'jitter': 15, 'overrun': 'skip'},
+}
+
+# Alert cycles are cut off after this many seconds; late lookups become partial or stale rows.
+cycle_deadline = 45
+# Time kept at the end of a cycle to publish partial rows before the deadline.
+cycle_publish_reserve = 2
+
+# Seconds between refreshes of the diagnostics page while it is open.
+diagnostics_refresh_interval = 5
+
+# Span tracing of alert cycles, written as Chrome trace-event JSON to this file on exit.
+# Off unless GOTOGLOBAL_TRACE is set; costs nothing when off.
+trace_file = os.environ.get('GOTOGLOBAL_TRACE')
+trace_max_events = 200_000
+
+# Requests the browser drops before they are sent ('*' matches any run of characters).
+# Blocked in the browser itself, so allowed requests never round-trip through Python.
+blocked_url_patterns = [
+    'https://car2govisibility.gototech.co/API/RT/reservationIssues',
+    'https://d15k2d11r6t6rl.cloudfront.net/public/users/Integrators/BeeProAgency/588880_570515/editor_images/7e2578ba-94b9-42ff-91e7-445b43f53d32.png',
+    '*content.powerapps.com/resource/webplayerbus/hashedresources/2jc6enofp9rqe/js/webplayer-authflow.js',
+    'chrome-extension://hokifickgkhplphjiodbggjmoafhignh/fonts/fabric-icons.woff',
+    '*autotel.crm4.dynamics.com/*/webresources/cc_MscrmControls.Grid.PCFGridControl/PCFGridControl.js',
+    '*goto.crm4.dynamics.com/*/webresources/cc_MscrmControls.FieldControls.TimerControl/css/TimerIcon.css',
+    '*goto.crm4.dynamics.com/apc/100k.gif*',
+    '*autotel.crm4.dynamics.com/apc/100k.gif*',
+    '*apps.powerapps.com/apphost/e/*',
+]
@@ -1,3 +1,14 @@
-from . import goto, autotel, pages, shared, frontend, app, workers
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # also lets PyInstaller and IDEs see the subpackages
+    from . import goto, autotel, pages, shared, frontend, app, workers
 
 __all__ = ["goto", "autotel", "pages", "shared", "frontend", "app", "workers"]
+
+
+def __getattr__(name):
+    # Subpackages load on first use, so importing src.shared.* doesn't pull in Qt or Playwright.
+    if name in __all__:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
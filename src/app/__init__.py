@@ -1,2 +1,17 @@
-from .app import start_app
-from . import common
\ No newline at end of file
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # also lets PyInstaller and IDEs see the modules
+    from .app import start_app
+    from . import common
+
+__all__ = ['start_app', 'common']
+
+
+def __getattr__(name):
+    # Loaded on first use, so single widgets (e.g. view.table_frame) import without the workers.
+    if name == 'start_app':
+        return importlib.import_module('.app', __name__).start_app
+    if name == 'common':
+        return importlib.import_module('.common', __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
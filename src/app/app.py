@@ -1,3 +1,4 @@
+from functools import partial
 from src.workers import WebDataWorker, WebAutomationWorker
 import settings
 from src.shared import utils
@@ -57,10 +58,14 @@ def create_web_data_worker(worker: WebDataWorker, web_automation_worker: WebAuto
 def create_web_automation_worker(main_win, worker: WebAutomationWorker, web_data_worker: WebDataWorker):
     worker.start()
     worker.toast_signal.connect(main_win.show_toast)
-    worker.late_table_row.connect(main_win.gotoInterface.late_rides_table.setRows)
-    worker.batteries_table_row.connect(main_win.autotelInterface.batteries_table.setRows)
-    worker.long_rides_table_row.connect(main_win.autotelInterface.long_rides_table.setRows)
+    worker.late_table_row.connect(main_win.gotoInterface.late_rides_table.applyDelta)
+    worker.batteries_table_row.connect(main_win.autotelInterface.batteries_table.applyDelta)
+    worker.long_rides_table_row.connect(main_win.autotelInterface.long_rides_table.applyDelta)
+    main_win.gotoInterface.late_rides_table.refreshRequested.connect(partial(worker.refresh_alert, 'late_rides'))
+    main_win.autotelInterface.batteries_table.refreshRequested.connect(partial(worker.refresh_alert, 'batteries'))
+    main_win.autotelInterface.long_rides_table.refreshRequested.connect(partial(worker.refresh_alert, 'long_rides'))
     worker.request_delete_table.connect(main_win.removeWidgets)
+    worker.api_status_changed.connect(main_win.setApiStatus)
     worker.request_x_token.connect(web_data_worker.enqueue_x_token)
     worker.request_pointer_location.connect(web_data_worker.enqueue_pointer_location)
     worker.open_url_requested.connect(web_data_worker.enqueue_url)
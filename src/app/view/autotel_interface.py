@@ -41,3 +41,10 @@ class AutotelInterface(GalleryInterface):
         if not cfg.get(cfg.batteries):
             self._remove(self.batteries_title)
             self._remove(self.batteries_table)
+
+    def setApiStatus(self, status: str):
+        """ Show the API status on every table of the interface """
+        if cfg.get(cfg.long_rides):
+            self.long_rides_table.setStatus(status)
+        if cfg.get(cfg.batteries):
+            self.batteries_table.setStatus(status)
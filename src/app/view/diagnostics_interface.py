@@ -0,0 +1,59 @@
+# coding:utf-8
+from PyQt6.QtCore import QTimer
+from PyQt6.QtGui import QFont
+from PyQt6.QtWidgets import QApplication, QHBoxLayout, QFileDialog
+
+from services.fluent.qfluentwidgets import SubtitleLabel, PlainTextEdit, PushButton, FluentIcon
+import settings
+from src.shared import metrics
+
+from .gallery_interface import GalleryInterface
+
+
+class DiagnosticsInterface(GalleryInterface):
+    """ Live view of the metrics registry """
+
+    def __init__(self, parent=None):
+        super().__init__(parent=parent)
+        self.setObjectName('diagnosticsInterface')
+        self.title = SubtitleLabel(self.tr('Diagnostics'), self)
+        self.copyButton = PushButton(FluentIcon.COPY, self.tr('Copy snapshot'), self)
+        self.exportButton = PushButton(FluentIcon.SAVE, self.tr('Export snapshot'), self)
+        self.snapshotView = PlainTextEdit(self)
+        self.snapshotView.setReadOnly(True)
+        self.snapshotView.setMinimumHeight(560)
+        self.snapshotView.setFont(QFont('Consolas', 9))
+
+        self.buttonLayout = QHBoxLayout()
+        self.buttonLayout.addWidget(self.title)
+        self.buttonLayout.addStretch(1)
+        self.buttonLayout.addWidget(self.copyButton)
+        self.buttonLayout.addWidget(self.exportButton)
+        self.vBoxLayout.addLayout(self.buttonLayout)
+        self.vBoxLayout.addWidget(self.snapshotView)
+
+        self.copyButton.clicked.connect(lambda: QApplication.clipboard().setText(metrics.REGISTRY.render_text()))
+        self.exportButton.clicked.connect(self.exportSnapshot)
+
+        # Rendered only while the page is visible, at a low rate
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(settings.diagnostics_refresh_interval * 1000)
+
+    def refresh(self):
+        if not self.isVisible():
+            return
+        scroll = self.snapshotView.verticalScrollBar().value()
+        self.snapshotView.setPlainText(metrics.REGISTRY.render_text())
+        self.snapshotView.verticalScrollBar().setValue(scroll)
+
+    def showEvent(self, e):
+        super().showEvent(e)
+        self.refresh()
+
+    def exportSnapshot(self):
+        path, _ = QFileDialog.getSaveFileName(self, self.tr('Export snapshot'), 'metrics.txt', 'Text files (*.txt)')
+        if not path:
+            return
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(metrics.REGISTRY.render_text())
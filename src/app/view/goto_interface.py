@@ -32,3 +32,8 @@ class GotoInterface(GalleryInterface):
         if not cfg.get(cfg.late_rides):
             self._remove(self.late_rides_title)
             self._remove(self.late_rides_table)
+
+    def setApiStatus(self, status: str):
+        """ Show the API status on every table of the interface """
+        if cfg.get(cfg.late_rides):
+            self.late_rides_table.setStatus(status)
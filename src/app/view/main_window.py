@@ -4,14 +4,15 @@ from PyQt6.QtCore import Qt, pyqtSignal, QEasingCurve, QUrl, QSize, QTimer
 from PyQt6.QtGui import QIcon, QDesktopServices, QColor
 from PyQt6.QtWidgets import QApplication
 
-from services.fluent.qfluentwidgets import (FluentWindow,
+from services.fluent.qfluentwidgets import (FluentWindow, FluentIcon,
                             SplashScreen, SystemThemeListener, isDarkTheme, NavigationItemPosition)
 import settings
-from src.shared import utils
+from src.shared import utils, metrics
 from ..common.config import cfg
 
 from .goto_interface import GotoInterface
 from .autotel_interface import AutotelInterface
+from .diagnostics_interface import DiagnosticsInterface
 
 from win11toast import toast
 
@@ -26,11 +27,13 @@ class MainWindow(FluentWindow):
 
         self.gotoInterface = GotoInterface(self)
         self.autotelInterface = AutotelInterface(self)
+        self.diagnosticsInterface = DiagnosticsInterface(self)
         self.navigationInterface.setAcrylicEnabled(True)
 
         pos = NavigationItemPosition.SCROLL
         self.addSubInterface(self.gotoInterface, QIcon(utils.resource_path(settings.app_icon)), "Goto", pos)
         self.addSubInterface(self.autotelInterface, QIcon(utils.resource_path(settings.autotel_icon)), "Autotel", pos)
+        self.addSubInterface(self.diagnosticsInterface, FluentIcon.DEVELOPER_TOOLS, "Diagnostics", NavigationItemPosition.BOTTOM)
         # self.navigationInterface.hide()
 
 
@@ -70,9 +73,22 @@ class MainWindow(FluentWindow):
             self.__remove(self.autotelInterface)
         if not cfg.get(cfg.late_rides):
             self.__remove(self.gotoInterface)
+    def setApiStatus(self, endpoint: str, state: str):
+        """ Show circuit breaker state changes of the public APIs on their tables """
+        interfaces = {
+            settings.goto_api_host: ('Goto', self.gotoInterface),
+            settings.autotel_api_host: ('Autotel', self.autotelInterface),
+        }
+        if endpoint not in interfaces:
+            return
+        name, interface = interfaces[endpoint]
+        if state == 'open':
+            interface.setApiStatus(f"{name} API degraded")
+        elif state == 'half_open':
+            interface.setApiStatus(f"{name} API degraded, retrying")
+        else:
+            interface.setApiStatus("")
 
-        if (not cfg.get(cfg.long_rides) and not cfg.get(cfg.batteries)) or not cfg.get(cfg.late_rides):
-            self.navigationInterface.hide()
     def resizeEvent(self, e):
         super().resizeEvent(e)
         if hasattr(self, 'splashScreen'):
@@ -91,6 +107,7 @@ class MainWindow(FluentWindow):
             QTimer.singleShot(100, lambda: self.windowEffect.setMicaEffect(self.winId(), isDarkTheme()))
             
     def show_toast(self, title, message, icon=None, duration='short'):
+        metrics.counter('toasts_total', 'Toasts shown').inc(title=title)
         def _run_toast():
             toast(title, message, icon=icon, duration=duration)
 
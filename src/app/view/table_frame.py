@@ -1,10 +1,12 @@
 from services.fluent.qfluentwidgets.components.widgets.label import SubtitleLabel
 from ..common.style_sheet import StyleSheet
 from typing import Callable
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtWidgets import QFrame, QHBoxLayout, QTableWidgetItem, QHeaderView, QWidget
-from services.fluent.qfluentwidgets import  TableWidget, PushButton, BodyLabel
+from services.fluent.qfluentwidgets import  TableWidget, PushButton, BodyLabel, RoundMenu, Action, FluentIcon
 from datetime import datetime
+from src.shared import tracing
+from src.shared.row_diff import RowDelta, cell_key, row_keys
 class Frame(QFrame):
 
     def __init__(self, parent=None):
@@ -19,6 +21,8 @@ class Frame(QFrame):
         self.hBoxLayout.addWidget(widget)
 
 class TableFrame(TableWidget):
+    # Emitted when the user asks for the table's alert to refresh now
+    refreshRequested = pyqtSignal()
 
     def __init__(self, columns,titleWidget: SubtitleLabel, parent=None):
         super().__init__(parent)
@@ -34,46 +38,143 @@ class TableFrame(TableWidget):
         self.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         self.horizontalHeader().setStretchLastSection(True)
         
+        self._rows: list[list] = []
+        self._keys: list = []
+        self._lastUpdated = "Loading..."
+        self._status = ""
         self.titleText = self.title.text()
-        self.title.setText(self.titleText + " (Last updated: Loading...)")
+        self._updateTitle()
 
+    @tracing.traced(category='gui')
     def setRows(self, rows_data: list[list[str | tuple[str, Callable]]]):
         """ Add multiple rows to the table """
+        self._lastUpdated = datetime.now().strftime('%H:%M')
+        self._updateTitle()
+        if self._sameLayout(rows_data):
+            self._updateCells(rows_data)
+            return
+
         self.setUpdatesEnabled(False)
         self.blockSignals(True)
         self.clearTable()
 
-        self.title.setText(self.titleText + f" (Last updated: {datetime.now().strftime('%H:%M')})")
-
-
         self.setRowCount(len(rows_data))
         for i, row_data in enumerate(rows_data):
-            
-            
             for col_index, data in enumerate(row_data):
-                if isinstance(data, tuple) and callable(data[1]):
-                    button = PushButton(str(data[0]))
-
-                    button.clicked.connect(data[1])
-                    button.setCursor(Qt.CursorShape.PointingHandCursor)
-                    container = QWidget()
-                    layout = QHBoxLayout(container)
-                    layout.addWidget(button)
-                    layout.setContentsMargins(0, 0, 0, 0)
-                    layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                    self.setCellWidget(i, col_index, container)
-                else:
-                    item = QTableWidgetItem("" if data is None else str(data))
-                    item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                    item.setFlags(item.flags() | Qt.ItemFlag.ItemIsEditable)
-                    item.setData(Qt.ItemDataRole.TextAlignmentRole, Qt.AlignmentFlag.AlignCenter)
-                    self.setItem(i, col_index, item)
-                self.setRowHeight(i, 64)
+                self._setCell(i, col_index, data)
+            self.setRowHeight(i, 64)
         # self.resizeRowsToContents()
+        self._rows = rows_data
+        self._keys = list(row_keys(rows_data))
         self.blockSignals(False)
         self.setUpdatesEnabled(True)
-    
+
+    @tracing.traced(category='gui')
+    def applyDelta(self, delta: RowDelta):
+        """ Apply the rows added, updated and removed since the last cycle """
+        if delta.reordered or self._keys != list(delta.previous):
+            return self.setRows(delta.rows)
+
+        self._lastUpdated = datetime.now().strftime('%H:%M')
+        self._updateTitle()
+        if delta.unchanged:
+            return
+
+        self.setUpdatesEnabled(False)
+        self.blockSignals(True)
+        for key in delta.removed:
+            self.removeRow(self._keys.index(key))
+            self._keys.remove(key)
+
+        positions = {key: i for i, key in enumerate(self._keys)}
+        for key, cells in delta.updated.items():
+            for col_index, data in cells.items():
+                self._replaceCell(positions[key], col_index, data)
+
+        for i, key in enumerate(delta.keys):
+            if key in delta.added:
+                self.insertRow(i)
+                for col_index, data in enumerate(delta.added[key]):
+                    self._setCell(i, col_index, data)
+                self.setRowHeight(i, 64)
+
+        self._rows = delta.rows
+        self._keys = list(delta.keys)
+        self.blockSignals(False)
+        self.setUpdatesEnabled(True)
+
+    def contextMenuEvent(self, e):
+        menu = RoundMenu(parent=self)
+        menu.addAction(Action(FluentIcon.SYNC, self.tr('Refresh now'), triggered=self.refreshRequested.emit))
+        menu.exec(e.globalPos())
+
+    def setStatus(self, status: str):
+        """ Show a status such as 'Autotel API degraded' next to the title; empty clears it """
+        self._status = status
+        self._updateTitle()
+
+    def _updateTitle(self):
+        status = f" - {self._status}" if self._status else ""
+        self.title.setText(self.titleText + f" (Last updated: {self._lastUpdated}){status}")
+
+    def _setCell(self, row, column, data):
+        if isinstance(data, tuple) and callable(data[1]):
+            button = PushButton(str(data[0]))
+
+            button.clicked.connect(data[1])
+            button.setCursor(Qt.CursorShape.PointingHandCursor)
+            container = QWidget()
+            layout = QHBoxLayout(container)
+            layout.addWidget(button)
+            layout.setContentsMargins(0, 0, 0, 0)
+            layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            self.setCellWidget(row, column, container)
+        else:
+            item = QTableWidgetItem("" if data is None else str(data))
+            item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsEditable)
+            item.setData(Qt.ItemDataRole.TextAlignmentRole, Qt.AlignmentFlag.AlignCenter)
+            self.setItem(row, column, item)
+
+    def _replaceCell(self, row, column, data):
+        """ Change one cell, reusing its item when it stays a text cell """
+        item = self.item(row, column)
+        if item is not None and self._cellKey(data)[0] == 'text':
+            item.setText(self._cellKey(data)[1])
+            return
+        self.removeCellWidget(row, column)
+        self.takeItem(row, column)
+        self._setCell(row, column, data)
+
+    # What a cell shows: button cells by label, text cells by text
+    _cellKey = staticmethod(cell_key)
+
+    def _sameLayout(self, rows_data) -> bool:
+        """ True if rows_data has the same rows and button cells as the table, so only text can differ """
+        if len(rows_data) != len(self._rows):
+            return False
+        for new_row, old_row in zip(rows_data, self._rows):
+            if len(new_row) != len(old_row):
+                return False
+            for new_data, old_data in zip(new_row, old_row):
+                new_key, old_key = self._cellKey(new_data), self._cellKey(old_data)
+                if new_key[0] != old_key[0] or (new_key[0] == 'button' and new_key != old_key):
+                    return False
+        return True
+
+    def _updateCells(self, rows_data):
+        """ Update only the text cells that changed """
+        for i, (new_row, old_row) in enumerate(zip(rows_data, self._rows)):
+            for col_index, (new_data, old_data) in enumerate(zip(new_row, old_row)):
+                new_key = self._cellKey(new_data)
+                if new_key[0] == 'text' and new_key != self._cellKey(old_data):
+                    self.item(i, col_index).setText(new_key[1])
+        self._rows = rows_data
+        self._keys = list(row_keys(rows_data))
+
     def clearTable(self):
         """ Clear all items in the table """
+        self._rows = []
+        self._keys = []
         self.setRowCount(0)
         self.clearContents()
@@ -1,31 +1,36 @@
-import asyncio
-from functools import partial
-import json
+from typing import Sequence
+
 import settings
 
-from src.shared import utils
+from src.shared import utils, tracing
+from src.shared.records import Car
+from src.shared.resilience import Failure
 from src.shared import BaseAlert
 
 class BatteriesAlert(BaseAlert):
-    def __init__(self, show_toast, gui_table_row, pointer, open_ride, x_token_request):
+    service_name = 'autotel'
+
+    def __init__(self, show_toast, gui_table_row, pointer, open_ride, hub):
         super().__init__(
             show_toast=show_toast,
             gui_table_row=gui_table_row,
             open_ride=open_ride,
-            x_token_request=x_token_request,
+            hub=hub,
         )
         self.pointer = pointer
+        self.locations = {}
         
-    async def start_requests(self, x_token: str):
-        self.x_token = x_token
+    async def start_requests(self):
         
         
         rows = await self.get_batteries_data()
         
+        if isinstance(rows, Failure):
+            return self.publish_rows(self.failure_rows(rows))
         if not rows:
-            return self.gui_table_row([['No batteries rides', '0', '0', '0', '0']])
+            return self.publish_rows([['No batteries rides', '0', '0', '0', '0']])
         
-        self.gui_table_row(rows)
+        self.publish_rows(rows)
 
         [self.notify_low_battery(row) for row in rows if self.should_notify_user_of_low_battery(row)]
 
@@ -44,54 +49,39 @@ class BatteriesAlert(BaseAlert):
         is_batteries_in_comment = any(k in (row[4] or '') for k in keywords)
         return is_low_battery and not is_in_tlv and not is_batteries_in_comment
                 
-    @utils.async_retry(allow_falsy=True)
     async def get_batteries_data(self):
-        data = await self.fetch_all_cars()
-        if not data or 'Data' not in data or not data.get('Data') or data.get('Data') == '[]':
-            return
-        data = json.loads(data.get('Data') or '[]')
-        return await self.process_batteries_data(data)
+        cars = await self.hub.snapshot('autotel', 'GetAllCars')
+        if isinstance(cars, Failure):
+            return cars
+        fingerprint = self.fingerprint(cars.fingerprint)
+        if (rows := self.reuse_previous(fingerprint)) is not None:
+            return rows
+        return self.remember(fingerprint, await self.process_batteries_data(cars.records))
 
-    async def fetch_all_cars(self):
-        url = 'https://autotelpublicapiprod.gototech.co/API/SEND/GetAllCars'
-        payload = {
-            'Data': 'null/null/1/false',
-            'Opcode': 'GetAllCars',
-            'Username': 'x',
-            'Password': 'x'
-        }
-        try:
-            if not self.x_token:
-                self.x_token = self.x_token_request('autotel')
-            data = await utils.fetch_data(url, self.x_token, payload)
-            if not data or 'Data' not in data or not data.get('Data') or data.get('Data') == '[]':
-                raise RuntimeError("No data received from Autotel API")
+    @tracing.traced(category='alert')
+    async def process_batteries_data(self, cars: Sequence[Car]):
+        cars = [car for car in cars if self.is_active_ride_and_electric(car)]
+        # One Pointer lookup for the whole cycle instead of one per car
+        plates = [car.licence_plate.replace('-', '') for car in cars]
+        self.locations = self.check_locations(plates, await self.pointer(plates)) if plates else {}
+        return await self.enrich(cars, self.generate_battery_report, self.build_error_row)
 
-        except Exception:
-            self.x_token = self.x_token_request('autotel')
-            data = await utils.fetch_data(url, self.x_token, payload)
-        return data
-    
-    async def process_batteries_data(self, data):
-        tasks = [asyncio.create_task(self.generate_battery_report(car)) for car in data if self.is_active_ride_and_electric(car)]
-        return await asyncio.gather(*tasks)
-
-    async def generate_battery_report(self, car):
-        ride_id = car.get('activeReservationNum')
-        license_plate = car.get('licencePlate', '')
-        battery = str(car.get('lastFuelPercentage', 0)) + '%'
-        location = self.pointer(license_plate.replace('-', ''))
+    async def generate_battery_report(self, car: Car):
+        ride_id = car.active_reservation_num
+        battery = f"{car.last_fuel_percentage}%"
+        location = self.locations.get(car.licence_plate.replace('-', ''), "Unknown Location")
             
-        url = self.build_ride_url(ride_id, settings.autotel_url)
-        open_ride_url = partial(self.open_ride.emit, url) if self.open_ride else None
+        open_ride_url = self.build_open_ride(ride_id, 'autotel', settings.autotel_url)
             
-        comment = await self.get_ride_comment(ride_id, 'autotel', 'https://autotelpublicapiprod.gototech.co/API/SEND')
-        row = [(ride_id, open_ride_url), license_plate, battery, location, comment]
+        comment = await self.get_ride_comment(ride_id, 'autotel')
+        row = [(ride_id, open_ride_url), car.licence_plate, battery, location, comment]
         return row
 
-    def is_active_ride_and_electric(self, car):
-        ride_id = car.get('activeReservationNum')
-        category = car.get('categoryId')
-        return ride_id and category and category == 1
-  
-    
\ No newline at end of file
+    def build_error_row(self, car: Car, error):
+        ride_id = car.active_reservation_num
+        battery = f"{car.last_fuel_percentage}%"
+        open_ride_url = self.build_open_ride(ride_id, 'autotel', settings.autotel_url)
+        return [(ride_id, open_ride_url), car.licence_plate, battery, "Unknown Location", f"Error: {type(error).__name__}"]
+
+    def is_active_ride_and_electric(self, car: Car):
+        return car.is_active_electric
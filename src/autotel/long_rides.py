@@ -1,9 +1,8 @@
-import asyncio
-from functools import partial
-import json
-from typing import Any, Dict, List
+from typing import Any, List, Sequence
 import settings
-from src.shared import utils, BaseAlert
+from src.shared import BaseAlert, tracing
+from src.shared.records import Reservation
+from src.shared.resilience import Failure
 from datetime import timedelta
 from datetime import datetime as dt
 
@@ -13,83 +12,74 @@ class LongRides(BaseAlert):
     This class is responsible for managing long rides, including
     their creation, updates, and any other related operations.
     """
-    def __init__(self, show_toast, gui_table_row, pointer, open_ride, x_token_request):
+    service_name = 'autotel'
+
+    def __init__(self, show_toast, gui_table_row, pointer, open_ride, hub):
         super().__init__(
             show_toast=show_toast,
             gui_table_row=gui_table_row,
             open_ride=open_ride,
-            x_token_request=x_token_request,
+            hub=hub,
         )
         self.pointer = pointer
+        self.locations = {}
 
         
-    async def start_requests(self, x_token: str):
+    async def start_requests(self):
         """
         Initiates the process of fetching and processing long rides.
         This method will create a new page for long rides and fetch
         the relevant data.
         """  
-        self.x_token = x_token
         # for _ in range(3):
         rows = await self.collect_rides_information()
 
+        if isinstance(rows, Failure):
+            return self.publish_rows(self.failure_rows(rows))
         if not rows:
-            return self.gui_table_row([['No long rides', '0', '0', '0', '0']])
+            return self.publish_rows([['No long rides', '0', '0', '0', '0']])
         
-        self.gui_table_row(rows)
+        self.publish_rows(rows)
 
-    @utils.async_retry(allow_falsy=True)
     async def collect_rides_information(self):
-        url = 'https://autotelpublicapiprod.gototech.co/API/SEND'
-        payload = {
-            'Data': "",
-            'Opcode': 'GetCurrentReservations',
-            'Username': 'x',
-            'Password': 'x'
-        }
-        data = await self.fetch_data_from_api(url, payload)
+        current = await self.hub.snapshot('autotel', 'GetCurrentReservations')
+        if isinstance(current, Failure):
+            return current
 
-        if not data or 'Data' not in data or not data.get('Data') or data.get('Data') == '[]':
-            return
+        long_rides = self.find_long_rides(current.records)
+        fingerprint = self.fingerprint(current.fingerprint, [ride.id for ride in long_rides])
+        if (rows := self.reuse_previous(fingerprint)) is not None:
+            return self.refresh_durations(rows, long_rides)
 
-        data = json.loads(data.get('Data', '[]'))
+        return self.remember(fingerprint, await self.parse_rows(long_rides))
 
-        return await self.parse_rows(data)
+    def find_long_rides(self, reservations: Sequence[Reservation]) -> List[Reservation]:
+        now = dt.now()
+        return [
+            ride for ride in reservations
+            if ride.actual_start_date is not None and now - ride.actual_start_date >= timedelta(hours=3)
+        ]
 
-    async def fetch_data_from_api(self, url, payload):
-        try:
-            if not self.x_token:
-                self.x_token = self.x_token_request('autotel')
-            data = await utils.fetch_data(url, self.x_token, payload)
-            if not data or 'Data' not in data or not data.get('Data') or data.get('Data') == '[]':
-                raise RuntimeError("No data received from Autotel API")
+    def refresh_durations(self, rows: List[List[Any]], long_rides: List[Reservation]) -> List[List[Any]]:
+        """Recomputes the duration column of reused rows; rows match long_rides by position."""
+        now = dt.now()
+        return [[row[0], row[1], now - ride.actual_start_date, *row[3:]] for row, ride in zip(rows, long_rides)]
 
-        except Exception:
-            self.x_token = self.x_token_request('autotel')
+    @tracing.traced(category='alert')
+    async def parse_rows(self, long_rides: List[Reservation]) -> List[List[Any]]:
+        # One Pointer lookup for the whole cycle instead of one per ride
+        plates = [ride.car_licence_plate.replace('-', '') for ride in long_rides]
+        self.locations = self.check_locations(plates, await self.pointer(plates)) if self.pointer and plates else {}
+        return await self.enrich(long_rides, self.build_row, self.build_error_row)
 
-            data = await utils.fetch_data(url, self.x_token, payload)
-        return data
+    async def build_row(self, ride: Reservation) -> List[Any]:
+        ride_id = str(ride.id or 'Unknown ID')
+        location = self.locations.get(ride.car_licence_plate.replace('-', ''), "Unknown Location")
+        open_ride_url = self.build_open_ride(ride_id, 'autotel', settings.autotel_url)
+        comment = await self.get_ride_comment(ride_id, 'autotel')
+        return [(ride_id, open_ride_url), ride.driver_name, dt.now() - ride.actual_start_date, location, comment]
 
-    async def parse_rows(self, data: List[Dict]) -> List[List[Any]]:
-        rows = []
-        for ride in data:
-            ride_id = str(ride.get('id', 'Unknown ID'))
-            driver_name = ride.get('driverFirstName', '') + ' ' + ride.get('driverLastName', '')
-            car_license = ride.get('carLicencePlate', '')
-            location = self.pointer(car_license.replace('-', '')) if self.pointer else "Unknown Location"
-            actual_start_date = utils.parse_time(ride.get('actualStartDate', ''))
-            if actual_start_date is not None:
-                duration = dt.now() - actual_start_date
-            else:
-                duration = timedelta(seconds=0)
-            row = [ride_id, driver_name, duration, location, ""]
-            if duration >= timedelta(hours=3):    
-                url = self.build_ride_url(ride_id, settings.autotel_url)
-                open_ride_url = partial(self.open_ride.emit, url) if self.open_ride else None
-                row[0] = (ride_id, open_ride_url)
-                comment = await self.get_ride_comment(ride_id, 'autotel', 'https://autotelpublicapiprod.gototech.co/API/SEND')
-                row[-1] = comment
-                rows.append(row)
-        
-        return rows
-        
\ No newline at end of file
+    def build_error_row(self, ride: Reservation, error) -> List[Any]:
+        ride_id = str(ride.id or 'Unknown ID')
+        open_ride_url = self.build_open_ride(ride_id, 'autotel', settings.autotel_url)
+        return [(ride_id, open_ride_url), ride.driver_name, dt.now() - ride.actual_start_date, "Unknown Location", f"Error: {type(error).__name__}"]
@@ -1,24 +1,27 @@
 from functools import partial
-import json
 import settings
 
 from datetime import datetime as dt, timedelta
-from src.shared import utils
+from src.shared import utils, tracing
+from src.shared.records import Reservation, FutureReservation
 from src.shared import BaseAlert
+from src.shared.resilience import Failure
 class LateAlert(BaseAlert):
-    def __init__(self, show_toast, gui_table_row, open_ride, x_token_request):
-        super().__init__(show_toast, gui_table_row, open_ride, x_token_request)
+    service_name = 'goto'
+
+    def __init__(self, show_toast, gui_table_row, open_ride, hub):
+        super().__init__(show_toast, gui_table_row, open_ride, hub)
         self.recently_notified = {}
         
-    async def start_requests(self, x_token):
-        self.x_token = x_token
-        
+    async def start_requests(self):
         late_rides = await self.fetch_late_rides()
         
-        if not late_rides or late_rides == "No result":
-            return self.gui_table_row([['No late rides', '0', '0', '0', '0']])
+        if isinstance(late_rides, Failure):
+            return self.publish_rows(self.failure_rows(late_rides))
+        if not late_rides:
+            return self.publish_rows([['No late rides', '0', '0', '0', '0']])
         
-        self.gui_table_row(late_rides)
+        self.publish_rows(late_rides)
         
         self.notify_late_ride_endings(late_rides)
 
@@ -51,111 +54,98 @@ class LateAlert(BaseAlert):
                 utils.resource_path(settings.app_icon)
             )
             
-    @utils.async_retry(allow_falsy=True)
     async def fetch_late_rides(self):
         """
         This function checks for late reservations.
-        :param x_token: X-Token for authentication
-        :return: List of late reservations
+        :return: List of late reservations, or a Failure if the API is unavailable
         """
-        url = 'https://car2gopublicapi.gototech.co/API/SEND'
-        payload = {
-            "Opcode": "getCurrentReservations",
-            "Data": "",
-            "username": "x",
-            "password": "x"
-        }
-        try:
-            if not self.x_token:
-                self.x_token = self.x_token_request('goto')
-            data = await utils.fetch_data(url, self.x_token, payload)
-            if not data or not data.get('Data'):
-                print('No data found for late rides:', data)
-                raise ValueError("No data found for late rides")
-        except Exception as e:
-            print('Error fetching late rides:', e)
-            self.x_token = self.x_token_request('goto')
-            if not self.x_token:
-                raise RuntimeError("Failed to fetch X-Token for Goto")
-            data = await utils.fetch_data(url, self.x_token, payload)
-
-        if not data or not data.get('Data') or data.get('Data') == '[]':
-            raise ValueError("No data found for late rides")
-        parsed_data = json.loads(data.get('Data', '[]'))
-        # print(parsed_data)
-        return await self.get_late_rides(parsed_data)
+        current = await self.hub.snapshot('goto', 'getCurrentReservations')
+        if isinstance(current, Failure):
+            return current
+        late_rides = self.find_late_rides(current.records)
+        # Rows also show each car's next ride, so a new booking must rebuild them.
+        future = await self.hub.snapshot('goto', 'GetFutureReservations') if late_rides else None
+        future_fingerprint = future.fingerprint if future else None
+        fingerprint = self.fingerprint(current.fingerprint, [ride.id for ride in late_rides], future_fingerprint)
+        if (rows := self.reuse_previous(fingerprint)) is not None:
+            return rows
+        return self.remember(fingerprint, await self.get_late_rides(late_rides))
+
+    def find_late_rides(self, reservations: list[Reservation]) -> list[Reservation]:
+        now = dt.now()
+        late_rides = []
+        for ride in reservations:
+            if ride.end_date is None:
+                print('No endDate found for ride:', ride.id)
+            elif ride.end_date <= now:
+                late_rides.append(ride)
+        return late_rides
     
-    async def get_late_rides(self, data):
+    @tracing.traced(category='alert')
+    async def get_late_rides(self, late_rides: list[Reservation]):
         """
-        This function processes the fetched data to find late rides.
-        :param data: Fetched data from the API
-        :return: List of late rides
+        This function enriches the late rides with comments and future rides.
+        :param late_rides: Reservations whose end date has passed
+        :return: List of late ride rows
         """
-        # print("Type of data:", type(data))
-        
+        if not late_rides:
+            return []
 
-        rows = []
-        for ride in data:
-            # print('Processing ride:', ride)
-            if not (endDate := ride.get('endDate')):
-                print('No endDate found for ride:', ride)
+        future_rides = await self.fetch_future_rides()
+        return await self.enrich(
+            late_rides,
+            partial(self.build_late_row, future_rides=future_rides),
+            self.build_error_row,
+        )
+
+    async def build_late_row(self, ride: Reservation, future_rides):
+        ride_id = ride.id or 'No ride ID found'
+        open_ride_url = self.build_open_ride(ride_id, 'goto', settings.goto_url)
+        comment = await self.get_ride_comment(ride_id, 'goto')
+        future_ride_id, future_ride_time = self.get_future_ride_info(ride.car_licence_plate, future_rides)
+
+        return [(ride_id, open_ride_url), ride.end_date.strftime("%d/%m/%Y %H:%M"), future_ride_id, future_ride_time, comment]
+
+    def build_error_row(self, ride: Reservation, error):
+        ride_id = ride.id or 'No ride ID found'
+        open_ride_url = self.build_open_ride(ride_id, 'goto', settings.goto_url)
+        return [(ride_id, open_ride_url), ride.end_date.strftime("%d/%m/%Y %H:%M"), "Error", "Error", f"Error: {type(error).__name__}"]
+
+    @tracing.traced(category='alert')
+    async def fetch_future_rides(self) -> dict[str, FutureReservation] | None:
+        """
+        Indexes the GetFutureReservations snapshot by car license.
+        :return: Dict of car license -> its earliest future ride, or None if it is unavailable
+        """
+        snapshot = await self.hub.snapshot('goto', 'GetFutureReservations')
+        if isinstance(snapshot, Failure):
+            print(f"Future rides unavailable: {snapshot.error}")
+            return None
+
+        future_rides = {}
+        for ride in snapshot.records:
+            if not ride.car_licence_plate or not ride.start_date:
                 continue
-            parsed_end_date = utils.parse_time(endDate)
-            car_license = ride.get('carLicencePlate')
-            ride_id = ride.get('id', 'No ride ID found')            
-            
-           
-            
-            if parsed_end_date and parsed_end_date <= dt.now():
-                url = self.build_ride_url(ride_id, settings.goto_url)
-                open_ride_url = partial(self.open_ride.emit, url) if self.open_ride else None
-                comment = await self.get_ride_comment(ride_id, 'goto', 'https://car2gopublicapi.gototech.co/API/SEND')
-                future_ride_id, future_ride_time = await self.get_future_ride_info(car_license)
-
-                row = [(ride_id, open_ride_url), parsed_end_date.strftime("%d/%m/%Y %H:%M"), future_ride_id, future_ride_time, comment]
-                rows.append(row)
-
-                
-        return rows
-    async def get_future_ride_info(self, car_license: str):
+            earliest = future_rides.get(ride.car_licence_plate)
+            if not earliest or ride.start_date < earliest.start_date:
+                future_rides[ride.car_licence_plate] = ride
+        return future_rides
+
+    def get_future_ride_info(self, car_license: str, future_rides: dict[str, FutureReservation] | None):
         """
-        Fetches the future ride information based on the car license.
+        Looks up the future ride information based on the car license.
         :param car_license: The license plate of the car
+        :param future_rides: Index built by fetch_future_rides
         :return: Tuple containing future ride ID and time
         """
+        if future_rides is None:
+            self.mark_degraded()
+            return "Unavailable", "Unavailable"
+
         if not car_license or car_license == "No result":
             return "No car license found", "No future ride found"
         
-        url = 'https://car2gopublicapi.gototech.co/API/SEND'
-        payload = {
-            "Username": "x",
-            "Password": "x",
-            "Opcode": "GetFutureReservations",
-            "Data": ""
-        }
-        
-        try:
-            data = await utils.fetch_data(url, self.x_token, payload)
-            if not data or not data.get('Data'):
-                raise ValueError("No data found for future ride info")
-        except Exception as e:
-            self.x_token = self.x_token_request('goto')
-
-            data = await utils.fetch_data(url, self.x_token, payload)
-
-        parsed_data = json.loads(data.get('Data', '[]'))
-        if not parsed_data:
+        if not (future_ride := future_rides.get(car_license)):
             return "No future ride", "No future ride"
-        
-        future_ride_id = None
-        future_ride_date = None
-        for ride in parsed_data:
-            if ride.get('carLicencePlate') != car_license:
-                continue
-            id = ride.get('id')
-            parsed_date = utils.parse_time(ride.get('startDate'), "%Y-%m-%dT%H:%M:%S")
-            if parsed_date and (not future_ride_date or parsed_date < future_ride_date):
-                future_ride_id = id
-                future_ride_date = parsed_date
 
-        return (future_ride_id, future_ride_date.strftime("%d/%m/%Y %H:%M")) if future_ride_date else ("No future ride", "No future ride")
+        return future_ride.id, future_ride.start_date.strftime("%d/%m/%Y %H:%M")
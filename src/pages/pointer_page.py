@@ -2,6 +2,9 @@ from time import sleep
 from playwright.async_api import Page
 
 class PointerPage:
+    # Column of #CarTableInfo holding the car's location
+    LOCATION_COLUMN = 12
+
     def __init__(self, page: Page):
         self.page = page
 
@@ -18,4 +21,36 @@ class PointerPage:
         if await matching_row.count() == 0:
             return "No results"
 
-        return (await matching_row.locator("td").nth(12).inner_text()).strip()
+        return (await matching_row.locator("td").nth(self.LOCATION_COLUMN).inner_text()).strip()
+
+    async def find_locations(self, plates: list[str]) -> dict[str, str]:
+        """
+        Locations of the given plates (digits only, no dashes), searched in a
+        single evaluation. Plates without a row are left out.
+        """
+        return await self.page.evaluate("""
+            ([plates, column]) => {
+                const wanted = new Set(plates);
+                const found = {};
+                for (const row of document.querySelectorAll('#CarTableInfo tbody tr')) {
+                    if (row.cells.length <= column) continue;
+                    for (const cell of row.cells) {
+                        const plate = cell.innerText.replace(/[^0-9A-Za-z]/g, '');
+                        if (wanted.has(plate) && !(plate in found)) {
+                            found[plate] = row.cells[column].innerText.trim();
+                        }
+                    }
+                }
+                return found;
+            }
+        """, [plates, self.LOCATION_COLUMN])
+
+    async def get_all_rows(self, timeout=10000) -> list[list[str]]:
+        """ The text of every cell of the car table, read in a single evaluation """
+        await self.page.wait_for_selector("#CarTableInfo tbody tr", state="attached", timeout=timeout)
+        return await self.page.evaluate("""
+            () => Array.from(
+                document.querySelectorAll('#CarTableInfo tbody tr'),
+                row => Array.from(row.cells, cell => cell.innerText.trim())
+            )
+        """)
@@ -1,9 +1,35 @@
-from .pointer_location import PointerLocation
-from . import utils
-from .base_alert import BaseAlert
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # also lets PyInstaller and IDEs see the modules
+    from .pointer_location import PointerLocation
+    from . import utils, http_client, decoding, resilience
+    from .base_alert import BaseAlert
+
+# Loaded on first use, so the pure helpers (rate_limit, single_flight, row_diff, ...)
+# import without Playwright or httpx.
+_lazy = {
+    'PointerLocation': '.pointer_location',
+    'BaseAlert': '.base_alert',
+    'utils': None,
+    'http_client': None,
+    'decoding': None,
+    'resilience': None,
+}
 
 __all__ = [
     'PointerLocation',
     'utils',
+    'http_client',
+    'decoding',
+    'resilience',
     'BaseAlert'
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    if name not in _lazy:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    if _lazy[name] is None:
+        return importlib.import_module(f".{name}", __name__)
+    return getattr(importlib.import_module(_lazy[name], __name__), name)
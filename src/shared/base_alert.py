@@ -1,53 +1,214 @@
-import json
-from src.shared import utils
+import asyncio
+from functools import partial
+import hashlib
+import time
+import settings
+from src.shared import deadline, tracing
+from src.shared.data_hub import DataHub
+from src.shared.row_diff import RowDiffer
+from src.shared.ttl_cache import TTLCache
+from src.shared.token_manager import Service
+from src.shared.resilience import Failure
+
+# Pointer answers that come from a fallback rather than the live table.
+DEGRADED_LOCATION_MARKERS = ('(stale)', '(Pointer reloading)', 'Error:')
 
 
 class BaseAlert:
     """
     Base class for alerts.
     """
-    def __init__(self, show_toast, gui_table_row, open_ride, x_token_request):
+    service_name: Service
+    # Shared by every alert, keyed by (service_name, ride_id).
+    comment_cache = TTLCache(maxsize=settings.comment_cache_size, ttl=settings.comment_cache_ttl)
+    _comment_refreshes: dict[tuple[str, str], asyncio.Task] = {}
+
+    def __init__(self, show_toast, gui_table_row, open_ride, hub: DataHub):
         self.show_toast = show_toast
         self.gui_table_row = gui_table_row
+        self.row_differ = RowDiffer()
         self.open_ride = open_ride
-        self.x_token_request = x_token_request
-        self.x_token = ""
+        self.hub = hub
+        self._previous: tuple[str, list, float, bool] | None = None
+        self._degraded = False
+        self.stats = {'reused': 0, 'recomputed': 0, 'deadline_misses': 0}
 
-    async def start_requests(self, x_token: str):
+    async def start_requests(self):
         """
         Starts the requests to fetch alerts.
         This method should be overridden in subclasses.
         """
         raise NotImplementedError("Subclasses must implement this method.")
-    
+
+    def fingerprint(self, data: str, *relevant) -> str:
+        """
+        Fingerprints a raw API payload together with any time-dependent
+        values (e.g. which rides are currently past a threshold) that the
+        alert's rows depend on.
+        """
+        digest = hashlib.blake2b(data.encode(), digest_size=16)
+        digest.update(repr(relevant).encode())
+        return digest.hexdigest()
+
+    def reuse_previous(self, fingerprint: str) -> list | None:
+        """
+        Returns the rows built for the same fingerprint last time, or None if
+        the payload changed, the rows are older than
+        settings.unchanged_payload_max_age or they were built from fallbacks.
+        """
+        if self._previous is None:
+            return None
+        previous_fingerprint, rows, built_at, degraded = self._previous
+        if degraded or previous_fingerprint != fingerprint or time.monotonic() - built_at > settings.unchanged_payload_max_age:
+            return None
+        self.stats['reused'] += 1
+        return rows
+
+    def remember(self, fingerprint: str, rows: list) -> list:
+        """ Keeps the rows for reuse_previous, unless mark_degraded() was called while building them """
+        self.stats['recomputed'] += 1
+        degraded, self._degraded = self._degraded, False
+        self._previous = (fingerprint, rows, time.monotonic(), degraded)
+        return rows
+
+    def mark_degraded(self):
+        """ The rows being built contain fallback cells, so they must be rebuilt next cycle """
+        self._degraded = True
+
+    def check_locations(self, plates: list[str], locations: dict[str, str]) -> dict[str, str]:
+        """ Marks the rows degraded when Pointer missed a plate or answered from a fallback """
+        if any(plate not in locations or any(marker in locations[plate] for marker in DEGRADED_LOCATION_MARKERS)
+               for plate in plates):
+            self.mark_degraded()
+        return locations
+
+    async def enrich(self, items, build_row, fallback_row=None) -> list:
+        """
+        Runs build_row(item) for every item concurrently, at most
+        settings.enrichment_concurrency at a time, and returns the rows in
+        the order of items.
+
+        An item whose build_row raises or exceeds settings.enrichment_timeout
+        is replaced by fallback_row(item, error), or dropped when no
+        fallback is given, so one bad ride can't fail the whole table.
+        Lookups still running near the cycle deadline are cut off the same
+        way, leaving time to publish the partial table.
+        """
+        semaphore = asyncio.Semaphore(settings.enrichment_concurrency)
+
+        async def run(item):
+            async with semaphore:
+                try:
+                    timeout = deadline.timeout_for(settings.enrichment_timeout, reserve=settings.cycle_publish_reserve)
+                    with tracing.span(f"{type(self).__name__} row", 'alert'):
+                        return await asyncio.wait_for(build_row(item), timeout=timeout)
+                except Exception as e:
+                    print(f"Error enriching {type(self).__name__} row: {type(e).__name__}: {e}")
+                    self.mark_degraded()
+                    return fallback_row(item, e) if fallback_row else None
+
+        rows = await asyncio.gather(*(run(item) for item in items))
+        return [row for row in rows if row is not None]
+
+    def failure_rows(self, failure: Failure) -> list[list]:
+        """
+        Placeholder rows telling the operator why the table is empty. When the
+        cycle deadline was missed the previous rows are kept instead, marked stale.
+        """
+        if failure.reason == 'deadline':
+            self.stats['deadline_misses'] += 1
+            if self._previous is not None:
+                return self.stale_rows(self._previous[1])
+        service = self.service_name.capitalize()
+        status = f"{service} API degraded" if failure.reason == 'circuit_open' else f"{service} API error"
+        return [[status, '-', '-', '-', str(failure.error or '')]]
+
+    def stale_rows(self, rows: list[list]) -> list[list]:
+        """ Copies rows with their last column marked as stale """
+        return [[*row[:-1], f"(stale) {row[-1]}"] for row in rows]
+
+    def publish_rows(self, rows: list[list]):
+        """ Sends the rows to the GUI as a RowDelta against the rows sent last time """
+        self.gui_table_row(self.row_differ.diff(rows))
+
+    def publish_stale(self):
+        """ Re-emits the last rows marked as stale, after the alert missed the cycle deadline """
+        if self._previous is not None:
+            self.publish_rows(self.stale_rows(self._previous[1]))
+
     def build_ride_url(self, ride, default_url):
         return f'{default_url}/index.html#/orders/{ride}/details'
-    
-    async def get_ride_comment(self, ride_id: str, service_name: str, url: str) -> str:
+
+    def build_open_ride(self, ride_id, service_name: str, default_url: str):
+        """
+        Returns a callback that opens the ride in the browser, or None if
+        there is no open_ride signal. Opening a ride drops its cached comment,
+        since the user is likely about to edit it.
         """
-        Fetches the ride comment from the Autotel API.
-        
+        if not self.open_ride:
+            return None
+        url = self.build_ride_url(ride_id, default_url)
+        return partial(self._open_ride, (service_name, str(ride_id)), url)
+
+    def _open_ride(self, cache_key, url):
+        self.comment_cache.invalidate(cache_key)
+        # Rebuild the rows next cycle, so the refetched comment shows up.
+        if self._previous is not None:
+            self._previous = (*self._previous[:3], True)
+        self.open_ride.emit(url)
+
+    @tracing.traced(category='alert')
+    async def get_ride_comment(self, ride_id: str, service_name: Service) -> str:
+        """
+        Returns the ride comment, served from the comment cache when possible.
+        A stale cached comment is returned immediately while a background task
+        fetches the current one.
+        """
+        key = (service_name, str(ride_id))
+        if (cached := self.comment_cache.lookup(key)) is not None:
+            comment, fresh = cached
+            if not fresh:
+                self._refresh_comment(key, ride_id, service_name)
+            return comment
+
+        comment = await self.fetch_ride_comment(ride_id, service_name)
+        if comment is None:
+            self.mark_degraded()
+            return "No comment"
+        self.comment_cache.set(key, comment)
+        return comment
+
+    def _refresh_comment(self, key, ride_id, service_name):
+        if key in self._comment_refreshes:
+            return
+
+        async def refresh():
+            try:
+                comment = await self.fetch_ride_comment(ride_id, service_name)
+                if comment is not None:
+                    self.comment_cache.set(key, comment)
+            except Exception as e:
+                # The stale comment stays in the cache and is refreshed again next time.
+                print(f"Error refreshing comment for ride {ride_id}: {type(e).__name__}: {e}")
+            finally:
+                self._comment_refreshes.pop(key, None)
+
+        self._comment_refreshes[key] = asyncio.create_task(refresh())
+
+    async def fetch_ride_comment(self, ride_id: str, service_name: Service) -> str | None:
+        """
+        Fetches the ride comment from the Goto/Autotel API.
+
         Args:
             ride_id (str): The ID of the ride.
-            x_token (str): The authentication token for the Autotel API.
-        
+            service_name (str): 'goto' or 'autotel'.
+
         Returns:
-            str: The ride comment if available, otherwise an empty string.
-        """
-        payload = {
-            'Data': f'/{ride_id}',
-            'Opcode': 'GetReservation',
-            'Username': 'x',
-            'Password': 'x'
-        }
-        try:
-            data = await utils.fetch_data(url, self.x_token, payload)
-            if not data or 'Data' not in data or not data.get('Data'):
-                raise RuntimeError(f"No data received for ride ID: {ride_id}")
-        except Exception:
-            self.x_token = self.x_token_request(service_name)
-            data = await utils.fetch_data(url, self.x_token, payload)
-        if not data or 'Data' not in data or not data.get('Data'):
-            return "No comment"
-        
-        return json.loads(data.get('Data', '{}')).get('comment', 'No comment')
\ No newline at end of file
+            str | None: The ride comment ('No comment' if the ride has none),
+            or None if the request failed.
+        """
+        reservation = await self.hub.reservation(service_name, ride_id)
+        if reservation is None:
+            return None
+
+        return reservation.get('comment') or 'No comment'
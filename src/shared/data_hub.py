@@ -0,0 +1,151 @@
+import hashlib
+import time
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import settings
+
+from . import utils, decoding
+from .resilience import Failure
+from .single_flight import SingleFlight
+from .token_manager import XTokenManager, Service, TokenUnavailableError
+
+API_URLS: dict[Service, str] = {
+    'goto': f'{settings.goto_api_url}/API/SEND',
+    'autotel': f'{settings.autotel_api_url}/API/SEND',
+}
+
+
+@dataclass(frozen=True, slots=True)
+class Feed:
+    """How to fetch and decode one (service, opcode) snapshot."""
+    service: Service
+    opcode: str
+    data: str = ''
+    path: str = ''
+    decode: Callable[[str], list] = decoding.decode_reservations
+
+
+# GetAllCars is decoded whole and cut down to active electric cars, so only
+# those are kept in the snapshot.
+FEEDS = {
+    (feed.service, feed.opcode): feed for feed in (
+        Feed('goto', 'getCurrentReservations'),
+        Feed('goto', 'GetFutureReservations', decode=decoding.decode_future_reservations),
+        Feed('autotel', 'GetCurrentReservations'),
+        Feed('autotel', 'GetAllCars', data='null/null/1/false', path='/GetAllCars',
+             decode=decoding.decode_active_electric_cars),
+    )
+}
+
+
+@dataclass(frozen=True, slots=True)
+class Snapshot:
+    """An immutable, decoded API response shared by every alert that reads it."""
+    service: Service
+    opcode: str
+    records: tuple
+    fingerprint: str
+    fetched_at: float
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.fetched_at
+
+
+class DataHub:
+    """
+    Owns every call to the Goto/Autotel APIs: X-Tokens, retries and decoding.
+
+    Alerts ask for the snapshots they need by (service, opcode). A snapshot
+    younger than settings.data_hub_max_age is shared, and concurrent requests
+    for the same feed wait on one fetch, so each opcode is fetched at most once
+    per cycle however many alerts read it.
+    """
+
+    def __init__(self, tokens: XTokenManager, max_age: float = settings.data_hub_max_age):
+        self.tokens = tokens
+        self.max_age = max_age
+        self._snapshots: dict[tuple[str, str], Snapshot] = {}
+        self._inflight = SingleFlight()
+        self.stats = {'fetches': 0, 'shared': 0, 'failures': 0}
+
+    async def snapshot(self, service: Service, opcode: str) -> Snapshot | Failure:
+        """ The latest snapshot of the feed, fetched if it's older than max_age """
+        key = (service, opcode)
+        current = self._snapshots.get(key)
+        if current is not None and current.age <= self.max_age:
+            self.stats['shared'] += 1
+            return current
+        return await self._inflight.do(key, lambda: self._refresh(FEEDS[key]))
+
+    async def _refresh(self, feed: Feed) -> Snapshot | Failure:
+        data = await self._fetch_feed(feed)
+        if isinstance(data, Failure):
+            self.stats['failures'] += 1
+            return data
+        self.stats['fetches'] += 1
+        raw = data['Data']
+        snapshot = Snapshot(
+            feed.service,
+            feed.opcode,
+            tuple(feed.decode(raw)) if raw != '[]' else (),
+            hashlib.blake2b(raw.encode(), digest_size=16).hexdigest(),
+            time.monotonic(),
+        )
+        self._snapshots[(feed.service, feed.opcode)] = snapshot
+        return snapshot
+
+    @utils.async_retry()
+    async def _fetch_feed(self, feed: Feed) -> dict:
+        data = await self.fetch(feed.service, feed.opcode, feed.data, feed.path)
+        if not data or not data.get('Data'):
+            raise ValueError(f"No data found for {feed.service} {feed.opcode}")
+        return data
+
+    async def fetch(self, service: Service, opcode: str, data: str = '', path: str = '') -> dict | Failure:
+        """
+        Posts one uncached request with the service's X-Token. If the token is
+        rejected (401/403, or a 200 with an empty Data) it is refreshed once
+        and the request retried; any other Failure is returned unchanged for
+        async_retry and the circuit breaker to handle. Raises CircuitOpenError
+        while the API's circuit breaker is open, DeadlineExceeded once the cycle
+        deadline passed and TokenUnavailableError, without sending anything,
+        when there is no X-Token.
+        """
+        url = API_URLS[service] + path
+        payload = {
+            'Data': data,
+            'Opcode': opcode,
+            'Username': 'x',
+            'Password': 'x'
+        }
+        x_token = await self.tokens.get(service)
+        if not x_token:
+            raise TokenUnavailableError(service)
+        response = await self._post(url, x_token, payload)
+        if not _token_rejected(response):
+            return response
+        x_token = await self.tokens.refresh(service, rejected=x_token)
+        if not x_token:
+            raise TokenUnavailableError(service)
+        return await self._post(url, x_token, payload)
+
+    async def _post(self, url: str, x_token: str, payload: dict) -> dict | Failure:
+        response = await utils.fetch_data(url, x_token, payload)
+        if isinstance(response, Failure) and response.reason in ('circuit_open', 'deadline'):
+            raise response.error
+        return response
+
+    async def reservation(self, service: Service, ride_id: str) -> dict[str, Any] | None:
+        """ A single reservation (GetReservation), or None if the request failed """
+        data = await self.fetch(service, 'GetReservation', f'/{ride_id}')
+        if not data or not data.get('Data'):
+            return None
+        return decoding.loads(data['Data'])
+
+
+def _token_rejected(response: dict | Failure) -> bool:
+    if isinstance(response, Failure):
+        return response.reason == 'unauthorized'
+    return not response or not response.get('Data')
@@ -0,0 +1,49 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_deadline: ContextVar[float | None] = ContextVar('cycle_deadline', default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when work starts after the current cycle deadline has passed."""
+
+
+@contextmanager
+def cycle_deadline(seconds: float):
+    """
+    Sets a deadline `seconds` from now for the current context. Tasks created
+    inside inherit it, so every HTTP call and Pointer lookup they make is
+    bounded by it.
+    """
+    token = _deadline.set(time.monotonic() + seconds)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> float | None:
+    """Seconds left until the current deadline, or None if there is none."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+def expired() -> bool:
+    return remaining() == 0.0
+
+
+def timeout_for(default: float, reserve: float = 0.0) -> float:
+    """
+    The timeout to use for one operation: `default`, shortened to what is
+    left of the deadline minus `reserve`. Raises DeadlineExceeded if nothing is left.
+    """
+    left = remaining()
+    if left is None:
+        return default
+    left -= reserve
+    if left <= 0:
+        raise DeadlineExceeded("Cycle deadline exceeded")
+    return min(default, left)
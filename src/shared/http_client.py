@@ -0,0 +1,130 @@
+import asyncio
+from urllib.parse import urlsplit
+
+import httpx
+import settings
+
+from . import deadline
+from .rate_limit import HostLimiter
+from .single_flight import SingleFlight
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class HttpClientPool:
+    """
+    Keeps one long-lived httpx.AsyncClient per host, so repeated API calls
+    reuse keep-alive connections instead of opening a new TCP+TLS connection
+    for every request.
+
+    A pool belongs to the event loop it was created on; use get_pool() from
+    inside a coroutine and close_pool() when the loop shuts down.
+    """
+
+    def __init__(self):
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._limits = httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry,
+        )
+        self.inflight = SingleFlight()
+        self.limiters: dict[str, HostLimiter] = {}
+        self.stats = {
+            'requests': 0,
+            'connections_opened': 0,
+            'connections_reused': 0,
+            'bytes_received': 0,
+        }
+
+    def client_for(self, url: str) -> httpx.AsyncClient:
+        parts = urlsplit(url)
+        host = f"{parts.scheme}://{parts.netloc}"
+        client = self._clients.get(host)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                base_url=host,
+                http2=HTTP2_AVAILABLE,
+                limits=self._limits,
+                timeout=settings.http_timeout,
+            )
+            self._clients[host] = client
+        return client
+
+    def limiter_for(self, url: str) -> HostLimiter:
+        host = urlsplit(url).hostname or ''
+        limiter = self.limiters.get(host)
+        if limiter is None:
+            config = settings.api_rate_limits.get(host, settings.api_rate_limit_default)
+            limiter = self.limiters[host] = HostLimiter(**config)
+        return limiter
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        opened = False
+
+        async def trace(event_name, info):
+            nonlocal opened
+            if event_name == 'connection.connect_tcp.complete':
+                opened = True
+
+        client = self.client_for(url)
+        limiter = self.limiter_for(url)
+        try:
+            await asyncio.wait_for(limiter.acquire(), timeout=deadline.remaining())
+        except asyncio.TimeoutError:
+            raise deadline.DeadlineExceeded(f"Cycle deadline passed waiting to call {url}") from None
+        # Only timeouts, 429 and 5xx mean the host is struggling; other errors
+        # (bad headers, cancellation, refused connections) leave its rate alone.
+        overloaded = False
+        try:
+            timeout = deadline.timeout_for(settings.http_timeout)
+            response = await client.post(url, extensions={'trace': trace}, timeout=timeout, **kwargs)
+            overloaded = response.status_code == 429 or response.status_code >= 500
+        except (httpx.TimeoutException, deadline.DeadlineExceeded) as e:
+            # Cut short by the cycle deadline rather than by a slow host.
+            if not deadline.expired():
+                overloaded = isinstance(e, httpx.TimeoutException)
+                raise
+            raise deadline.DeadlineExceeded(f"Cycle deadline passed during {url}") from e
+        finally:
+            limiter.release(overloaded)
+
+        self.stats['requests'] += 1
+        self.stats['connections_opened' if opened else 'connections_reused'] += 1
+        self.stats['bytes_received'] += len(response.content)
+        return response
+
+    def reuse_ratio(self) -> float:
+        requests = self.stats['requests']
+        return self.stats['connections_reused'] / requests if requests else 0.0
+
+    async def aclose(self):
+        clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            try:
+                await client.aclose()
+            except Exception as e:
+                print(f"[WARN] Failed to close HTTP client: {e}")
+
+
+_pools: dict[asyncio.AbstractEventLoop, HttpClientPool] = {}
+
+
+def get_pool() -> HttpClientPool:
+    """Returns the client pool owned by the running event loop."""
+    loop = asyncio.get_running_loop()
+    pool = _pools.get(loop)
+    if pool is None:
+        pool = _pools[loop] = HttpClientPool()
+    return pool
+
+
+async def close_pool():
+    """Closes every client owned by the running event loop."""
+    pool = _pools.pop(asyncio.get_running_loop(), None)
+    if pool is not None:
+        await pool.aclose()
@@ -0,0 +1,167 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable
+
+# Upper bounds in seconds; the last bucket catches everything slower.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+Labels = tuple[tuple[str, str], ...]
+
+
+def _labels(labels: dict) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format(name: str, labels: Labels) -> str:
+    if not labels:
+        return name
+    return name + '{' + ','.join(f'{key}="{value}"' for key, value in labels) + '}'
+
+
+class Counter:
+    """ A value that only goes up, e.g. requests or toasts shown """
+
+    def __init__(self, name: str, help: str, lock: threading.Lock):
+        self.name, self.help = name, help
+        self._values: dict[Labels, float] = {}
+        self._lock = lock
+
+    def inc(self, amount: float = 1, **labels):
+        key = _labels(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def lines(self) -> list[str]:
+        return [f"{_format(self.name, key)} {value:g}" for key, value in sorted(self._values.items())]
+
+
+class Gauge:
+    """ A value that goes up and down, e.g. a queue depth """
+
+    def __init__(self, name: str, help: str, lock: threading.Lock):
+        self.name, self.help = name, help
+        self._values: dict[Labels, float] = {}
+        self._lock = lock
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[_labels(labels)] = value
+
+    def lines(self) -> list[str]:
+        return [f"{_format(self.name, key)} {value:g}" for key, value in sorted(self._values.items())]
+
+
+class Histogram:
+    """ Latencies in fixed buckets; reports count, sum and estimated p50/p95 """
+
+    def __init__(self, name: str, help: str, lock: threading.Lock, buckets=DEFAULT_BUCKETS):
+        self.name, self.help = name, help
+        self.buckets = tuple(buckets)
+        self._series: dict[Labels, list] = {}
+        self._lock = lock
+
+    def observe(self, value: float, **labels):
+        key = _labels(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0, 0.0, [0] * (len(self.buckets) + 1)]
+            series[0] += 1
+            series[1] += value
+            series[2][bisect.bisect_left(self.buckets, value)] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def quantile(self, q: float, **labels) -> float | None:
+        series = self._series.get(_labels(labels))
+        return self._quantile(series, q) if series else None
+
+    def _quantile(self, series, q: float) -> float:
+        count, _, counts = series
+        rank, seen = q * count, 0
+        for index, bucket_count in enumerate(counts):
+            seen += bucket_count
+            if seen >= rank:
+                return self.buckets[index] if index < len(self.buckets) else float('inf')
+        return float('inf')
+
+    def lines(self) -> list[str]:
+        lines = []
+        for key, series in sorted(self._series.items()):
+            count, total, _ = series
+            name = _format(self.name, key)
+            lines.append(f"{name} count={count} avg={total / count * 1000:.1f}ms "
+                         f"p50<={self._quantile(series, 0.5) * 1000:g}ms p95<={self._quantile(series, 0.95) * 1000:g}ms")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Central, thread-safe registry of counters, gauges and latency histograms.
+
+    Stats that already live on objects (alert.stats, pool.stats, ...) are
+    added as collectors, which are only called when a snapshot is rendered.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: dict[str, Counter | Gauge | Histogram] = {}
+        self._collectors: dict[str, Callable[[], dict]] = {}
+
+    def _get(self, kind, name: str, help: str, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = kind(name, help, self._lock, **kwargs)
+        if not isinstance(metric, kind):
+            raise TypeError(f"Metric {name} is a {type(metric).__name__}, not a {kind.__name__}")
+        return metric
+
+    def counter(self, name: str, help: str = '') -> Counter:
+        return self._get(Counter, name, help)
+
+    def gauge(self, name: str, help: str = '') -> Gauge:
+        return self._get(Gauge, name, help)
+
+    def histogram(self, name: str, help: str = '', buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._get(Histogram, name, help, buckets=buckets)
+
+    def register_collector(self, name: str, collect: Callable[[], dict]):
+        """ collect() returns a flat dict of values, read whenever a snapshot is rendered """
+        self._collectors[name] = collect
+
+    def render_text(self) -> str:
+        """ A plain-text snapshot of every metric, suitable for attaching to a ticket """
+        lines = [f"# Metrics snapshot {time.strftime('%Y-%m-%d %H:%M:%S')}"]
+        with self._lock:
+            for name in sorted(self._metrics):
+                metric = self._metrics[name]
+                lines.append(f"# {name}: {metric.help}" if metric.help else f"# {name}")
+                lines.extend(metric.lines())
+        for name, collect in sorted(self._collectors.items()):
+            try:
+                values = collect()
+            except Exception as e:
+                values = {'error': f"{type(e).__name__}: {e}"}
+            lines.append(f"# {name}")
+            lines.extend(f"{name}.{key} {_value(value)}" for key, value in values.items())
+        return '\n'.join(lines) + '\n'
+
+
+def _value(value) -> str:
+    return f"{value:.3g}" if isinstance(value, float) else str(value)
+
+
+REGISTRY = MetricsRegistry()
+counter = REGISTRY.counter
+gauge = REGISTRY.gauge
+histogram = REGISTRY.histogram
+register_collector = REGISTRY.register_collector
@@ -1,5 +1,4 @@
 
-from src.shared import utils
 from . import BaseAlert
 
 
@@ -7,15 +6,15 @@ class NotificationAlert(BaseAlert):
     """
     Class for handling notifications.
     """
-    def __init__(self, show_toast, gui_table_row, open_ride, x_token_request):
-        super().__init__(show_toast, gui_table_row, open_ride, x_token_request)
+    service_name = 'goto'
 
-    async def add_notification(self, x_token: str, data: dict):
+    def __init__(self, show_toast, gui_table_row, open_ride, hub):
+        super().__init__(show_toast, gui_table_row, open_ride, hub)
+
+    async def add_notification(self, data: dict):
         """
         Starts the requests to fetch notifications.
         """
-        self.x_token = x_token
-
         car_info = await self.fetch_car_info(data.get('license_plate', ''))
 
         if not car_info:
@@ -29,16 +28,8 @@ class NotificationAlert(BaseAlert):
         if not license_plate:
             return None
         
-        url = 'https://car2gopublicapi.gototech.co/API/SEND'
-        payload = {
-            "Username": "x",
-            "Password": "x",
-            "Opcode": "GetCarInfo",
-            "Data": license_plate
-        }
-        
         try:
-            data = await utils.fetch_data(url, self.x_token, payload)
+            data = await self.hub.fetch('goto', 'GetCarInfo', license_plate)
             return data.get('Data', {})
         except Exception as e:
             print(f"Error fetching car info: {e}")
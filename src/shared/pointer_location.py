@@ -1,6 +1,12 @@
+import time
+
+from playwright.async_api import Page, Response
+
 from services import AsyncWebAccess
 from src import pages
+import settings
 from src.shared import utils
+from src.shared.pointer_parsing import extract_locations, index_rows, normalize_plate
 
 
 class PointerLocation:
@@ -15,6 +21,70 @@ class PointerLocation:
         :param webaccess: An instance of WebAccess to interact with the web page.
         """
         self.webaccess = webaccess
+        # Normalised plate -> location, from the last whole-table snapshot
+        self.locations: dict[str, str] = {}
+        # Normalised plate -> location, parsed from the page's fleet responses
+        self.network_locations: dict[str, str] = {}
+        # Normalised plate -> (location, reload generation, time stored)
+        self._cache: dict[str, tuple[str, int, float]] = {}
+        self.generation = 0
+        self.reloading = False
+        self.stats = {'responses': 0, 'recognised': 0, 'cache_hits': 0, 'stale_hits': 0}
+        if 'pointer' in webaccess.pages:
+            self.listen(webaccess.pages['pointer'])
+
+    def listen(self, page: Page):
+        """ Index fleet data from the page's XHR/fetch responses as they arrive """
+        page.on('response', self._on_response)
+
+    async def _on_response(self, response: Response):
+        if response.request.resource_type not in ('xhr', 'fetch'):
+            return
+        if 'json' not in response.headers.get('content-type', ''):
+            return
+        try:
+            payload = await response.json()
+        except Exception:
+            return
+        self.stats['responses'] += 1
+        if found := extract_locations(payload):
+            self.stats['recognised'] += 1
+            self.network_locations.update(found)
+
+    def begin_reload(self):
+        """
+        Starts a new reload generation. Until end_reload(), peek() answers
+        from the previous generation's cached locations, labelled as stale.
+        """
+        self.generation += 1
+        self.reloading = True
+        self.locations = {}
+        self.network_locations = {}
+
+    def end_reload(self):
+        self.reloading = False
+
+    def peek(self, query: str) -> str | None:
+        """
+        Answers a lookup without touching the page, so it never needs
+        pointer_lock: from the network index or this generation's cache, or
+        during a reload from the last cached value marked '(stale)'.
+        None if the page has to be searched.
+        """
+        plate = normalize_plate(query)
+        if not self.reloading and (location := self.network_locations.get(plate)):
+            return location
+        entry = self._cache.get(plate)
+        if entry is None:
+            return None
+        location, generation, stored_at = entry
+        if self.reloading:
+            self.stats['stale_hits'] += 1
+            return f"{location} (stale)"
+        if generation == self.generation and time.monotonic() - stored_at <= settings.pointer_cache_ttl:
+            self.stats['cache_hits'] += 1
+            return location
+        return None
     
     
     async def login(self, user, phone):
@@ -34,12 +104,76 @@ class PointerLocation:
         login_page = pages.PointerLoginPage(self.webaccess.pages['pointer'])
         await login_page.fill_otp(otp)
     
+    async def refresh_snapshot(self) -> int:
+        """
+        Reads the whole Pointer car table in one evaluation and indexes it by
+        plate. Call it after every reload of the Pointer page.
+
+        :return: The number of plates indexed.
+        """
+        pointer_page = pages.PointerPage(self.webaccess.pages['pointer'])
+        rows = await pointer_page.get_all_rows()
+        self.locations = index_rows(rows, pointer_page.LOCATION_COLUMN)
+        return len(self.locations)
+
     async def search_location(self, query: str):
         """
         Searches for a location using the provided query string.
+        Served from the fleet responses captured from the network, then from
+        the table snapshot (taken on first use if there is none yet); falls
+        back to filtering the table in the DOM if no snapshot can be taken.
+        Results are cached for the current reload generation.
 
         :param query: The location query to search for.
         """
+        location = await self._search_location(query)
+        self._cache[normalize_plate(query)] = (location, self.generation, time.monotonic())
+        return location
+
+    async def search_locations(self, queries: list[str]) -> dict[str, str]:
+        """
+        Batch version of search_location: resolves every plate from the
+        network index or table snapshot, and the rest in one in-page
+        evaluation instead of one DOM query per plate.
+
+        :param queries: Licence plates, with or without dashes.
+        :return: Mapping of each query to its location ("No results" if not found).
+        """
+        results, pending = {}, []
+        for query in queries:
+            plate = normalize_plate(query)
+            if location := self.network_locations.get(plate) or self.locations.get(plate):
+                results[query] = location
+            elif self.locations:
+                results[query] = "No results"
+            else:
+                pending.append(query)
+
+        if pending:
+            pointer_page = pages.PointerPage(self.webaccess.pages['pointer'])
+            found = await pointer_page.find_locations([normalize_plate(query) for query in pending])
+            for query in pending:
+                results[query] = found.get(normalize_plate(query), "No results")
+
+        now = time.monotonic()
+        for query, location in results.items():
+            self._cache[normalize_plate(query)] = (location, self.generation, now)
+        return results
+
+    async def _search_location(self, query: str):
+        plate = normalize_plate(query)
+        if location := self.network_locations.get(plate):
+            return location
+        if self.network_locations and not self.locations:
+            return "No results"
+        if not self.locations:
+            try:
+                await self.refresh_snapshot()
+            except Exception as e:
+                print(f"Pointer snapshot failed: {type(e).__name__}: {e}")
+        if self.locations:
+            return self.locations.get(plate, "No results")
+
         pointer_page =  pages.PointerPage(self.webaccess.pages['pointer'])
         data = await pointer_page.get_first_row_data(query)
         return data
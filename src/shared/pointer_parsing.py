@@ -0,0 +1,84 @@
+import json
+import re
+from collections import Counter
+
+
+def normalize_plate(plate: str) -> str:
+    """ Licence plates compare without dashes, spaces or other separators """
+    return re.sub(r'[^0-9A-Za-z]', '', plate or '')
+
+
+def is_plate(text: str) -> bool:
+    """
+    Whether a table cell reads as a licence plate: 5 to 8 digits, separated by
+    nothing but dashes or spaces, so times and dates ('12:04 18/10') don't count.
+    """
+    return bool(re.fullmatch(r'[0-9 -]+', text or '')) and 5 <= len(normalize_plate(text)) <= 8
+
+
+# Field names (compared case-insensitively) that carry a car's plate and
+# location in the fleet payloads Pointer's page fetches in the background.
+PLATE_FIELDS = ('licenseplate', 'licenceplate', 'carnumber', 'carno', 'licensenumber', 'vehiclenumber', 'plate')
+LOCATION_FIELDS = ('address', 'lastaddress', 'location', 'lastlocation', 'currentaddress')
+
+
+def extract_locations(payload) -> dict[str, str]:
+    """
+    Finds plate -> location pairs anywhere in a decoded fleet payload.
+    Returns an empty dict if the payload has no recognised fields.
+    """
+    found = {}
+    stack = [payload]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, str) and node[:1] in ('[', '{'):
+            # ASP.NET services wrap their JSON in a string, e.g. {"d": "[...]"}
+            try:
+                stack.append(json.loads(node))
+            except ValueError:
+                pass
+        elif isinstance(node, list):
+            stack.extend(node)
+        elif isinstance(node, dict):
+            fields = {str(key).lower(): value for key, value in node.items()}
+            plate = next((fields[key] for key in PLATE_FIELDS if fields.get(key)), None)
+            location = next((fields[key] for key in LOCATION_FIELDS if fields.get(key)), None)
+            if plate and isinstance(location, str):
+                found[normalize_plate(str(plate))] = location.strip()
+            else:
+                stack.extend(value for value in node.values() if isinstance(value, (list, dict, str)))
+    return found
+
+
+def plate_column(rows: list[list[str]], location_column: int) -> int | None:
+    """
+    The column of the Pointer car table holding the plates: the one where the
+    most rows read as a plate, the leftmost on a tie. None if no cell does.
+    The table's columns vary between accounts, so it is found from the data;
+    another all-digit column (e.g. a kilometre count) would only win if it
+    filled more rows than the plates do.
+    """
+    counts = Counter(
+        column
+        for cells in rows if len(cells) > location_column
+        for column, cell in enumerate(cells) if column != location_column and is_plate(cell)
+    )
+    if not counts:
+        return None
+    return max(counts, key=lambda column: (counts[column], -column))
+
+
+def index_rows(rows: list[list[str]], location_column: int) -> dict[str, str]:
+    """
+    Indexes the rows of the Pointer car table by normalised plate, read from
+    the plate column only. The first row wins if a plate appears twice.
+    """
+    column = plate_column(rows, location_column)
+    if column is None:
+        return {}
+    locations = {}
+    for cells in rows:
+        if len(cells) <= max(column, location_column) or not is_plate(cells[column]):
+            continue
+        locations.setdefault(normalize_plate(cells[column]), cells[location_column])
+    return locations
@@ -0,0 +1,95 @@
+import asyncio
+import time
+from collections import deque
+
+
+class HostLimiter:
+    """
+    Token bucket plus a cap on in-flight requests for a single host.
+
+    Both the request rate and the in-flight cap adapt with AIMD: every
+    healthy response raises them a little (up to the configured values),
+    and a 429, a 5xx or a timeout halves them.
+    """
+
+    def __init__(self, rate: float, burst: int, max_in_flight: int,
+                 min_rate: float = 0.5, min_in_flight: int = 1):
+        self.max_rate = rate
+        self.min_rate = min_rate
+        self.max_in_flight = max_in_flight
+        self.min_in_flight = min_in_flight
+        self.burst = burst
+
+        self.rate = float(rate)
+        self.limit = float(max_in_flight)
+        self.in_flight = 0
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self._waiters: deque[asyncio.Future] = deque()
+        self.stats = {'healthy': 0, 'overloaded': 0, 'backoffs': 0}
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self):
+        while self.in_flight >= int(self.limit):
+            future = asyncio.get_running_loop().create_future()
+            self._waiters.append(future)
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    # We were handed a slot we will not use; pass it on.
+                    self._wake()
+                raise
+            finally:
+                if future in self._waiters:
+                    self._waiters.remove(future)
+        self.in_flight += 1
+        try:
+            await self._take_token()
+        except BaseException:
+            self.in_flight -= 1
+            self._wake()
+            raise
+
+    def release(self, overloaded: bool):
+        self.in_flight -= 1
+        if overloaded:
+            self.stats['overloaded'] += 1
+            self.stats['backoffs'] += 1
+            self.limit = max(self.min_in_flight, self.limit / 2)
+            self.rate = max(self.min_rate, self.rate / 2)
+        else:
+            self.stats['healthy'] += 1
+            self.limit = min(self.max_in_flight, self.limit + 1 / self.limit)
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+        self._wake()
+
+    def snapshot(self) -> dict:
+        return {
+            'rate': round(self.rate, 2),
+            'limit': int(self.limit),
+            'in_flight': self.in_flight,
+            'queue_depth': self.queue_depth,
+            **self.stats,
+        }
+
+    async def _take_token(self):
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+            self._refilled_at = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def _wake(self):
+        free = int(self.limit) - self.in_flight
+        while free > 0 and self._waiters:
+            future = self._waiters.popleft()
+            if not future.done():
+                future.set_result(None)
+                free -= 1
@@ -0,0 +1,86 @@
+from datetime import datetime as dt
+
+from src.shared import utils
+
+
+def parse_api_time(value: str | None) -> dt | None:
+    """Parses an API timestamp into a naive local datetime."""
+    if not value:
+        return None
+    try:
+        parsed = dt.fromisoformat(value)
+    except ValueError:
+        return utils.parse_time(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+
+class Reservation:
+    """A current reservation (getCurrentReservations / GetCurrentReservations)."""
+    __slots__ = ('id', 'car_licence_plate', 'driver_first_name', 'driver_last_name',
+                 'actual_start_date', 'end_date', 'comment')
+
+    def __init__(self, id, car_licence_plate: str, driver_first_name: str, driver_last_name: str,
+                 actual_start_date: dt | None, end_date: dt | None, comment: str | None):
+        self.id = id
+        self.car_licence_plate = car_licence_plate
+        self.driver_first_name = driver_first_name
+        self.driver_last_name = driver_last_name
+        self.actual_start_date = actual_start_date
+        self.end_date = end_date
+        self.comment = comment
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> 'Reservation':
+        return cls(
+            raw.get('id'),
+            raw.get('carLicencePlate') or '',
+            raw.get('driverFirstName') or '',
+            raw.get('driverLastName') or '',
+            parse_api_time(raw.get('actualStartDate')),
+            parse_api_time(raw.get('endDate')),
+            raw.get('comment'),
+        )
+
+    @property
+    def driver_name(self) -> str:
+        return f"{self.driver_first_name} {self.driver_last_name}"
+
+
+class FutureReservation:
+    """An upcoming reservation (GetFutureReservations)."""
+    __slots__ = ('id', 'car_licence_plate', 'start_date')
+
+    def __init__(self, id, car_licence_plate: str, start_date: dt | None):
+        self.id = id
+        self.car_licence_plate = car_licence_plate
+        self.start_date = start_date
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> 'FutureReservation':
+        return cls(raw.get('id'), raw.get('carLicencePlate') or '', parse_api_time(raw.get('startDate')))
+
+
+class Car:
+    """A fleet car (GetAllCars), limited to the fields the alerts use."""
+    __slots__ = ('active_reservation_num', 'licence_plate', 'last_fuel_percentage', 'category_id')
+
+    def __init__(self, active_reservation_num, licence_plate: str, last_fuel_percentage, category_id):
+        self.active_reservation_num = active_reservation_num
+        self.licence_plate = licence_plate
+        self.last_fuel_percentage = last_fuel_percentage
+        self.category_id = category_id
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> 'Car':
+        return cls(
+            raw.get('activeReservationNum'),
+            raw.get('licencePlate') or '',
+            raw.get('lastFuelPercentage') or 0,
+            raw.get('categoryId'),
+        )
+
+    @property
+    def is_active_electric(self) -> bool:
+        return bool(self.active_reservation_num) and self.category_id == 1
@@ -0,0 +1,115 @@
+import random
+import time
+from dataclasses import dataclass
+from typing import Callable, Literal
+
+import settings
+
+BreakerState = Literal['closed', 'open', 'half_open']
+
+
+@dataclass(frozen=True)
+class Failure:
+    """
+    Returned instead of a result when a call gave up. It is falsy, so
+    `if not result` checks keep treating it as "no data".
+    """
+    error: BaseException | None = None
+    attempts: int = 1
+    reason: Literal['error', 'circuit_open', 'deadline', 'unauthorized'] = 'error'
+    endpoint: str | None = None
+
+    def __bool__(self):
+        return False
+
+    def __str__(self):
+        return f"{self.reason} after {self.attempts} attempt(s): {self.error}"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised to fail fast while an endpoint's circuit breaker is open."""
+
+    def __init__(self, endpoint: str):
+        super().__init__(f"Circuit open for {endpoint}")
+        self.endpoint = endpoint
+
+
+def backoff_delay(attempt: int, base: float | None = None, cap: float | None = None) -> float:
+    """Exponential backoff with full jitter for the given 0-based attempt."""
+    base = settings.retry_base_delay if base is None else base
+    cap = settings.retry_max_delay if cap is None else cap
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """
+    Closed: requests flow. After `failure_threshold` consecutive failures
+    the breaker opens and callers fail fast. After `reset_timeout` seconds one
+    trial request is let through (half-open); its outcome closes or reopens
+    the breaker.
+    """
+
+    def __init__(self, endpoint: str, failure_threshold: int | None = None, reset_timeout: float | None = None):
+        self.endpoint = endpoint
+        self.failure_threshold = failure_threshold or settings.circuit_failure_threshold
+        self.reset_timeout = reset_timeout or settings.circuit_reset_timeout
+        self.state: BreakerState = 'closed'
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+
+    def allow(self) -> bool:
+        if self.state == 'closed':
+            return True
+        if self.state == 'open' and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self._set_state('half_open')
+        if self.state == 'half_open' and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self._trial_in_flight = False
+        if self.state != 'closed':
+            self._set_state('closed')
+
+    def record_failure(self):
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.state == 'half_open' or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            if self.state != 'open':
+                self._set_state('open')
+
+    def release_trial(self):
+        """Frees the half-open trial without an outcome, e.g. when it was cancelled."""
+        self._trial_in_flight = False
+
+    def _set_state(self, state: BreakerState):
+        self.state = state
+        for listener in list(_listeners):
+            try:
+                listener(self.endpoint, state)
+            except Exception as e:
+                print(f"Circuit breaker listener failed: {e}")
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_listeners: list[Callable[[str, BreakerState], None]] = []
+
+
+def get_breaker(endpoint: str) -> CircuitBreaker:
+    breaker = _breakers.get(endpoint)
+    if breaker is None:
+        breaker = _breakers[endpoint] = CircuitBreaker(endpoint)
+    return breaker
+
+
+def breaker_states() -> dict[str, BreakerState]:
+    return {endpoint: breaker.state for endpoint, breaker in _breakers.items()}
+
+
+def add_state_listener(listener: Callable[[str, BreakerState], None]):
+    """Calls listener(endpoint, state) whenever a breaker changes state."""
+    _listeners.append(listener)
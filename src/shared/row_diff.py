@@ -0,0 +1,84 @@
+from dataclasses import dataclass, field
+from typing import Any, Hashable
+
+RowKey = tuple[Hashable, int]
+
+
+def cell_key(data) -> tuple[str, str]:
+    """ What a cell shows: button cells (label, callback) by label, text cells by text """
+    if isinstance(data, tuple) and len(data) == 2 and callable(data[1]):
+        return ('button', str(data[0]))
+    return ('text', "" if data is None else str(data))
+
+
+def row_keys(rows: list[list]) -> tuple[RowKey, ...]:
+    """
+    Keys rows by their first cell (the ride id, or the label of a placeholder
+    row), numbered by occurrence so duplicate ids stay distinct.
+    """
+    seen: dict[Hashable, int] = {}
+    keys = []
+    for row in rows:
+        first = row[0] if row else None
+        ride_id = cell_key(first)[1]
+        occurrence = seen[ride_id] = seen.get(ride_id, -1) + 1
+        keys.append((ride_id, occurrence))
+    return tuple(keys)
+
+
+@dataclass(frozen=True, slots=True)
+class RowDelta:
+    """
+    The change from one cycle's rows to the next.
+
+    `rows` is the full new table in order, so a view that is out of sync
+    (its keys differ from `previous`) or sees `reordered` can rebuild instead.
+    """
+    keys: tuple[RowKey, ...]
+    previous: tuple[RowKey, ...]
+    rows: list[list]
+    added: dict[RowKey, list] = field(default_factory=dict)
+    updated: dict[RowKey, dict[int, Any]] = field(default_factory=dict)
+    removed: tuple[RowKey, ...] = ()
+    reordered: bool = False
+
+    @property
+    def unchanged(self) -> bool:
+        return not (self.added or self.updated or self.removed or self.reordered)
+
+
+class RowDiffer:
+    """ Diffs each cycle's rows of one table against the previous cycle's """
+
+    def __init__(self):
+        self._keys: tuple[RowKey, ...] = ()
+        self._rows: dict[RowKey, list] = {}
+
+    def diff(self, rows: list[list]) -> RowDelta:
+        keys = row_keys(rows)
+        new_rows = dict(zip(keys, rows))
+
+        added, updated = {}, {}
+        for key, row in new_rows.items():
+            old = self._rows.get(key)
+            if old is None:
+                added[key] = row
+            elif old is not row:
+                if len(old) != len(row):
+                    cells = dict(enumerate(row))
+                else:
+                    cells = {i: cell for i, (cell, old_cell) in enumerate(zip(row, old))
+                             if cell_key(cell) != cell_key(old_cell)}
+                if cells:
+                    updated[key] = cells
+
+        removed = tuple(key for key in self._keys if key not in new_rows)
+        surviving = [key for key in keys if key in self._rows]
+        reordered = surviving != [key for key in self._keys if key in new_rows]
+
+        delta = RowDelta(keys, self._keys, rows, added, updated, removed, reordered)
+        self._keys, self._rows = keys, new_rows
+        return delta
+
+    def reset(self):
+        self._keys, self._rows = (), {}
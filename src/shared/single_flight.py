@@ -0,0 +1,30 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key: the first caller starts the
+    coroutine, everyone who arrives while it is in flight awaits the same
+    result (or exception) instead of issuing a duplicate request.
+    """
+
+    def __init__(self):
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        self.stats = {'calls': 0, 'shared': 0}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        self.stats['calls'] += 1
+        future = self._inflight.get(key)
+        if future is not None:
+            self.stats['shared'] += 1
+            return await asyncio.shield(future)
+
+        # The call runs in its own task, so a cancelled first caller doesn't
+        # cancel it for everyone else who is waiting on the same key.
+        future = asyncio.ensure_future(func())
+        self._inflight[key] = future
+        future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Nobody may be waiting on it, so mark a stored exception as retrieved.
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        return await asyncio.shield(future)
@@ -0,0 +1,102 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Literal
+
+import settings
+
+from . import deadline, tracing
+
+Service = Literal['goto', 'autotel']
+
+
+class TokenUnavailableError(RuntimeError):
+    """Raised when no X-Token could be obtained, e.g. the browser is not logged in."""
+
+    def __init__(self, service: Service):
+        super().__init__(f"No X-Token for {service}, check the browser login")
+        self.service = service
+
+
+class _Token:
+    __slots__ = ('value', 'obtained_at')
+
+    def __init__(self, value: str):
+        self.value = value
+        self.obtained_at = time.monotonic()
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.obtained_at
+
+
+class XTokenManager:
+    """
+    Caches the X-Token of each service on the automation event loop.
+
+    - get() returns the cached token, fetching one if there is none.
+    - refresh() replaces a rejected token; concurrent callers await the same
+      refresh instead of each asking the browser for a token.
+    - When a token is rejected, its age is kept as the observed lifetime and
+      later tokens are refreshed in the background shortly before reaching it.
+    """
+
+    def __init__(self, fetch_token: Callable[[Service], Awaitable[str | None]]):
+        self._fetch_token = fetch_token
+        self._tokens: dict[Service, _Token] = {}
+        self._lifetimes: dict[Service, float] = {}
+        self._refreshing: dict[Service, asyncio.Future] = {}
+        self.stats = {'refreshes': 0, 'proactive_refreshes': 0, 'failed_refreshes': 0}
+
+    async def get(self, service: Service) -> str | None:
+        token = self._tokens.get(service)
+        if token is None:
+            return await self.refresh(service)
+
+        lifetime = self._lifetimes.get(service)
+        if lifetime and token.age >= lifetime - settings.x_token_refresh_margin and service not in self._refreshing:
+            self.stats['proactive_refreshes'] += 1
+            self._start_refresh(service)
+        return token.value
+
+    async def refresh(self, service: Service, rejected: str | None = None) -> str | None:
+        """
+        Fetches a new token for the service. `rejected` is a token the API
+        refused (401/403 or an empty response); pass it only for real
+        rejections, since its age is kept as the token lifetime. If the cached
+        token already differs from it, someone else refreshed it in the
+        meantime and the cached token is returned without a new fetch.
+        """
+        token = self._tokens.get(service)
+        if rejected is not None and token is not None:
+            if token.value != rejected:
+                return token.value
+            # A lifetime inside the refresh margin would refresh on every get().
+            if token.age > settings.x_token_refresh_margin:
+                self._lifetimes[service] = token.age
+            del self._tokens[service]
+
+        future = self._refreshing.get(service) or self._start_refresh(service)
+        return await asyncio.wait_for(asyncio.shield(future), timeout=deadline.remaining())
+
+    def invalidate(self, service: Service):
+        self._tokens.pop(service, None)
+
+    def _start_refresh(self, service: Service) -> asyncio.Future:
+        future = asyncio.ensure_future(self._do_refresh(service))
+        self._refreshing[service] = future
+        future.add_done_callback(lambda _: self._refreshing.pop(service, None))
+        return future
+
+    async def _do_refresh(self, service: Service) -> str | None:
+        self.stats['refreshes'] += 1
+        try:
+            with tracing.span('X-Token refresh', 'token', service=service):
+                value = await asyncio.wait_for(self._fetch_token(service), timeout=settings.x_token_request_timeout)
+        except Exception as e:
+            print(f"Failed to refresh X-Token for {service}: {type(e).__name__}: {e}")
+            value = None
+        if not value:
+            self.stats['failed_refreshes'] += 1
+            return self._tokens[service].value if service in self._tokens else None
+        self._tokens[service] = _Token(value)
+        return value
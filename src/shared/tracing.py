@@ -0,0 +1,150 @@
+import asyncio
+import atexit
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+from functools import wraps
+
+import settings
+
+# Tracing is switched on for the whole run by settings.trace_file (or the
+# GOTOGLOBAL_TRACE environment variable). When it is off, span() returns a
+# shared no-op and traced() returns the function undecorated.
+_trace_file: str | None = settings.trace_file
+_events: deque = deque(maxlen=settings.trace_max_events)
+_tracks: dict[tuple, int] = {}          # (thread, running task) -> trace row
+_free_tracks: dict[int, list[int]] = {}  # thread -> rows of finished tasks
+_next_tid = itertools.count(1)
+_lock = threading.Lock()
+_pid = os.getpid()
+
+
+def enabled() -> bool:
+    return _trace_file is not None
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ('name', 'category', 'args', 'started')
+
+    def __init__(self, name: str, category: str, args: dict):
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.started = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        ended = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args['error'] = exc_type.__name__
+        _events.append({
+            'name': self.name,
+            'cat': self.category,
+            'ph': 'X',
+            'ts': self.started / 1000,
+            'dur': (ended - self.started) / 1000,
+            'pid': _pid,
+            'tid': _track(),
+            'args': self.args,
+        })
+        return False
+
+
+def _track() -> int:
+    """
+    A trace viewer row per thread, and per running asyncio task within a
+    thread, so concurrent spans of one event loop don't overlap on the same
+    row. A finished task hands its row back for the thread's next task, so
+    the number of rows stays at the peak number of concurrently traced tasks.
+    """
+    thread = threading.current_thread()
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    key = (thread.ident, id(task) if task else None)
+    if (tid := _tracks.get(key)) is not None:
+        return tid
+    with _lock:
+        free = _free_tracks.setdefault(thread.ident, [])
+        reused = bool(task and free)
+        tid = _tracks[key] = free.pop() if reused else next(_next_tid)
+    if task:
+        task.add_done_callback(lambda _: _release(key))
+    if not reused:
+        name = f"{thread.name} / task row {tid}" if task else thread.name
+        _events.append({'name': 'thread_name', 'ph': 'M', 'pid': _pid, 'tid': tid, 'args': {'name': name}})
+    return tid
+
+
+def _release(key: tuple):
+    with _lock:
+        tid = _tracks.pop(key, None)
+        if tid is not None:
+            _free_tracks.setdefault(key[0], []).append(tid)
+
+
+def span(name: str, category: str = 'app', **args):
+    """
+    Times the enclosed block as one trace event:
+
+        with tracing.span('GetFutureReservations', 'http', rides=len(rides)):
+            ...
+    """
+    if _trace_file is None:
+        return _NOOP
+    return _Span(name, category, args)
+
+
+def traced(name: str | None = None, category: str = 'app'):
+    """ Decorator recording every call of a function or coroutine as a span """
+    def decorator(func):
+        if _trace_file is None:
+            return func
+        label = name or func.__qualname__
+
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with _Span(label, category, {}):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with _Span(label, category, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def write(path: str | None = None):
+    """ Writes the recorded spans as Chrome trace-event JSON (chrome://tracing, Perfetto) """
+    path = path or _trace_file
+    if path is None:
+        return
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump({'traceEvents': list(_events), 'displayTimeUnit': 'ms'}, file)
+    print(f"Wrote {len(_events)} trace events to {path}")
+
+
+if _trace_file is not None:
+    atexit.register(write)
@@ -0,0 +1,65 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class TTLCache:
+    """
+    Bounded LRU cache whose entries go stale after `ttl` seconds.
+
+    Stale entries are still returned by lookup() (flagged as not fresh), so
+    callers can serve them right away and refresh in the background.
+    Entries are dropped for good after `max_stale` seconds.
+    Thread safe, so the GUI thread may invalidate entries.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 600, max_stale: float | None = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_stale = max_stale if max_stale is not None else ttl * 6
+        self._entries: OrderedDict[Hashable, tuple[Any, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'evictions': 0}
+
+    def lookup(self, key: Hashable) -> tuple[Any, bool] | None:
+        """Returns (value, is_fresh), or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            value, stored_at = entry
+            age = time.monotonic() - stored_at
+            if age > self.max_stale:
+                del self._entries[key]
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            fresh = age <= self.ttl
+            self.stats['hits' if fresh else 'stale_hits'] += 1
+            return value, fresh
+
+    def set(self, key: Hashable, value: Any):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def hit_rate(self) -> float:
+        hits = self.stats['hits'] + self.stats['stale_hits']
+        total = hits + self.stats['misses']
+        return hits / total if total else 0.0
+
+    def __len__(self):
+        return len(self._entries)
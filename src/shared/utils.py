@@ -17,10 +17,15 @@ def resource_path(relative_path):
 
     return os.path.join(base_path, relative_path)
 import asyncio
+import json
 import time
 from functools import wraps
-import httpx
 import traceback
+from urllib.parse import urlsplit
+import settings
+from . import http_client, resilience, deadline, tracing, metrics
+from .resilience import CircuitOpenError, Failure
+from .token_manager import TokenUnavailableError
 def parse_time(time_str: str, dt_format: str = "%Y-%m-%dT%H:%M:%S.%f") -> dt | None:
     try:
         if "." in time_str:
@@ -36,63 +41,131 @@ def parse_time(time_str: str, dt_format: str = "%Y-%m-%dT%H:%M:%S.%f") -> dt | N
         return None
 
     
-async def fetch_data(request_url: str, x_token: str, payload: Dict) -> Dict:
+async def fetch_data(request_url: str, x_token: str, payload: Dict) -> Dict | Failure:
+    """
+    Posts the payload to the API and returns the decoded JSON response, or a
+    Failure if the request failed or the host's circuit breaker is open.
+    Concurrent calls with the same url, token and payload share one request.
+    """
+    pool = http_client.get_pool()
+    key = (request_url, x_token, json.dumps(payload, sort_keys=True))
+    with tracing.span(str(payload.get('Opcode')), 'http', url=request_url, data=str(payload.get('Data'))):
+        return await pool.inflight.do(key, lambda: _post_json(pool, request_url, x_token, payload))
+
+async def _post_json(pool: http_client.HttpClientPool, request_url: str, x_token: str, payload: Dict) -> Dict | Failure:
+    endpoint = urlsplit(request_url).hostname or request_url
+    breaker = resilience.get_breaker(endpoint)
+    if not breaker.allow():
+        return Failure(CircuitOpenError(endpoint), reason='circuit_open', endpoint=endpoint)
+    trial = breaker.state == 'half_open'
+    try:
+        return await _send(pool, breaker, request_url, x_token, payload, endpoint)
+    finally:
+        # A cancelled or timed-out trial says nothing about the endpoint; let the next call try.
+        if trial:
+            breaker.release_trial()
+
+async def _send(pool: http_client.HttpClientPool, breaker: resilience.CircuitBreaker, request_url: str,
+                x_token: str, payload: Dict, endpoint: str) -> Dict | Failure:
     headers = {
         "Content-Type": "application/json",
         "Accept": "application/json",
         "X-Token": x_token
     }
+    opcode = str(payload.get('Opcode'))
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(request_url, json=payload, headers=headers, timeout=15)
-            response.raise_for_status()
-            return response.json()
+        with metrics.histogram('api_request_seconds', 'Public API request latency').time(opcode=opcode):
+            response = await pool.post(request_url, json=payload, headers=headers)
+    except deadline.DeadlineExceeded as e:
+        metrics.counter('api_requests_total', 'Public API requests by outcome').inc(opcode=opcode, status='deadline')
+        return Failure(e, reason='deadline', endpoint=endpoint)
     except Exception as e:
-        print(f"Request error: {type(e).__name__}: {e}, request_url: {request_url}, x_token: {x_token}, payload: {payload},")
-        return {}
+        metrics.counter('api_requests_total', 'Public API requests by outcome').inc(opcode=opcode, status=type(e).__name__)
+        breaker.record_failure()
+        print(f"Request error: {type(e).__name__}: {e}, request_url: {request_url}, payload: {payload},")
+        return Failure(e, endpoint=endpoint)
 
-def async_retry(retries=3, delay=1, allow_falsy=False):
+    metrics.counter('api_requests_total', 'Public API requests by outcome').inc(opcode=opcode, status=response.status_code)
+    if response.status_code == 429 or response.status_code >= 500:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+    if response.status_code in (401, 403):
+        return Failure(RuntimeError(f"X-Token rejected ({response.status_code})"), reason='unauthorized', endpoint=endpoint)
+    try:
+        response.raise_for_status()
+        return response.json()
+    except Exception as e:
+        print(f"Request error: {type(e).__name__}: {e}, request_url: {request_url}, payload: {payload},")
+        return Failure(e, endpoint=endpoint)
+
+def async_retry(retries=settings.retry_count, delay=None, allow_falsy=False):
+    """
+    Decorator to retry a coroutine with exponential backoff and jitter.
+
+    :param retries: Number of attempts before giving up.
+    :param delay: Base delay in seconds, doubled on every attempt (default settings.retry_base_delay).
+    :param allow_falsy: Accept falsy results instead of retrying them.
+    :return: The result of the coroutine, or a Failure once all attempts failed.
+        A CircuitOpenError, a missing X-Token or a passed cycle deadline fails fast
+        without further attempts.
+    """
     def decorator(func):
         @wraps(func)
         async def async_wrapper(*args, **kwargs):
+            error = None
             for attempt in range(retries):
                 try:
                     result = await func(*args, **kwargs)
+                    if isinstance(result, Failure) and result.reason in ('circuit_open', 'deadline'):
+                        return result
                     if not allow_falsy and not result:
                         raise ValueError("Function returned a falsy value")
                     return result
+                except CircuitOpenError as e:
+                    return Failure(e, attempt + 1, 'circuit_open', e.endpoint)
+                except deadline.DeadlineExceeded as e:
+                    return Failure(e, attempt + 1, 'deadline')
+                except TokenUnavailableError as e:
+                    # Retrying won't log the browser in.
+                    return Failure(e, attempt + 1)
                 except Exception as e:
+                    error = e
                     if attempt < retries - 1:
-                        await asyncio.sleep(delay)
-                    else:
-                        print(f"Function {func.__name__} failed after {retries} attempts")
-                        # Optionally log the exception
-                        print(f"Last exception: {e}")
-                        
+                        pause = resilience.backoff_delay(attempt, delay)
+                        left = deadline.remaining()
+                        if left is not None and pause >= left:
+                            return Failure(deadline.DeadlineExceeded("No time left to retry"), attempt + 1, 'deadline')
+                        await asyncio.sleep(pause)
+            print(f"Function {func.__name__} failed after {retries} attempts")
+            print(f"Last exception: {error}")
+            return Failure(error, retries)
 
         return async_wrapper
     return decorator
 
-def retry(retries=3, delay=1, allow_falsy=False):
+def retry(retries=settings.retry_count, delay=None, allow_falsy=False):
     """
-    Decorator to retry a function call with a specified number of retries and delay.
+    Decorator to retry a function call with exponential backoff and jitter.
 
-    :param retries: Number of retries before giving up.
-    :param delay: Delay between retries in seconds.
-    :return: The result of the function if successful, otherwise raises the last exception.
+    :param retries: Number of attempts before giving up.
+    :param delay: Base delay in seconds, doubled on every attempt (default settings.retry_base_delay).
+    :return: The result of the function if successful, otherwise a Failure.
     """
     def decorator(func):
+        @wraps(func)
         def wrapper(*args, **kwargs):
+            error = None
             for attempt in range(retries):
                 try:
                     result = func(*args, **kwargs)
                     if not allow_falsy and not result:
                         raise ValueError("Function returned a falsy value")
                     return result
-                except Exception:
+                except Exception as e:
+                    error = e
                     if attempt < retries - 1:
-                        time.sleep(delay)
-            return "No result"
+                        time.sleep(resilience.backoff_delay(attempt, delay))
+            return Failure(error, retries)
         return wrapper
     return decorator
-        
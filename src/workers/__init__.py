@@ -1,2 +1,20 @@
-from .web_automation_worker import WebAutomationWorker
-from .web_data_worker import WebDataWorker
\ No newline at end of file
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # also lets PyInstaller and IDEs see the modules
+    from .web_automation_worker import WebAutomationWorker
+    from .web_data_worker import WebDataWorker
+
+_lazy = {
+    'WebAutomationWorker': '.web_automation_worker',
+    'WebDataWorker': '.web_data_worker',
+}
+
+__all__ = list(_lazy)
+
+
+def __getattr__(name):
+    # Loaded on first use, so the Qt-free alert_scheduler imports on its own.
+    if name in _lazy:
+        return getattr(importlib.import_module(_lazy[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,108 @@
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Literal
+
+OverrunPolicy = Literal['skip', 'coalesce']
+
+
+@dataclass
+class ScheduledJob:
+    name: str
+    run: Callable[[], Awaitable[None]]
+    interval: float
+    jitter: float = 0.0
+    overrun: OverrunPolicy = 'skip'
+    next_run: float = 0.0
+    task: asyncio.Task | None = None
+    pending: bool = False
+    stats: dict = field(default_factory=lambda: {'runs': 0, 'skipped': 0, 'coalesced': 0, 'triggered': 0})
+
+
+class AlertScheduler:
+    """
+    Runs each job on its own interval, randomised by +/- jitter seconds so
+    jobs drift apart instead of hitting the API together.
+
+    A job still running when it comes due again is either skipped
+    (overrun='skip') or run once more as soon as the current run ends
+    (overrun='coalesce'), however many ticks it missed meanwhile.
+    All methods must be called on the scheduler's event loop.
+    """
+
+    def __init__(self):
+        self.jobs: dict[str, ScheduledJob] = {}
+        self._wake = asyncio.Event()
+        self._running = False
+
+    def add(self, name: str, run: Callable[[], Awaitable[None]], interval: float,
+            jitter: float = 0.0, overrun: OverrunPolicy = 'skip'):
+        first_run = time.monotonic() + random.uniform(0, jitter)
+        self.jobs[name] = ScheduledJob(name, run, interval, jitter, overrun, next_run=first_run)
+        self._wake.set()
+
+    def trigger(self, name: str):
+        """ Runs the job now, or right after its current run if one is in progress """
+        job = self.jobs.get(name)
+        if job is None:
+            return
+        job.stats['triggered'] += 1
+        if self._is_running(job):
+            job.pending = True
+        else:
+            job.next_run = time.monotonic()
+            self._wake.set()
+
+    async def run(self):
+        """ Runs the jobs until stop() is called, then cancels any still in progress """
+        self._running = True
+        try:
+            while self._running:
+                now = time.monotonic()
+                for job in self.jobs.values():
+                    if job.next_run <= now:
+                        self._due(job, now)
+
+                next_run = min((job.next_run for job in self.jobs.values()), default=now + 1)
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=max(0.0, next_run - time.monotonic()))
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            tasks = [job.task for job in self.jobs.values() if self._is_running(job)]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stop(self):
+        self._running = False
+        self._wake.set()
+
+    def _due(self, job: ScheduledJob, now: float):
+        job.next_run = now + max(0.0, job.interval + random.uniform(-job.jitter, job.jitter))
+        if not self._is_running(job):
+            self._start(job)
+        elif job.overrun == 'coalesce':
+            job.stats['coalesced'] += 1
+            job.pending = True
+        else:
+            job.stats['skipped'] += 1
+            print(f"Skipping {job.name}: previous run still in progress")
+
+    def _start(self, job: ScheduledJob):
+        job.stats['runs'] += 1
+        job.task = asyncio.create_task(job.run())
+        job.task.add_done_callback(lambda task: self._finished(job, task))
+
+    def _finished(self, job: ScheduledJob, task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            print(f"{job.name} failed: {type(task.exception()).__name__}: {task.exception()}")
+        if job.pending and self._running:
+            job.pending = False
+            self._start(job)
+
+    @staticmethod
+    def _is_running(job: ScheduledJob) -> bool:
+        return job.task is not None and not job.task.done()
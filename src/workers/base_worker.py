@@ -2,19 +2,25 @@
 import asyncio
 from PyQt6.QtCore import pyqtSignal, pyqtSlot, QThread
 
+from src.shared import http_client
+
 
 class BaseWorker(QThread):
     def __init__(self, parent=None):
         super(BaseWorker, self).__init__(parent)
         self.stop_event = asyncio.Event()
+        self.loop = None
         self.running = True
         
     @pyqtSlot()
     def run(self):
         self.loop = asyncio.new_event_loop()
         asyncio.set_event_loop(self.loop)
-        self.loop.run_until_complete(self._async_main())
-        self.loop.close()
+        try:
+            self.loop.run_until_complete(self._async_main())
+        finally:
+            self.loop.run_until_complete(http_client.close_pool())
+            self.loop.close()
     
     async def _async_main(self):
         raise NotImplementedError("Subclasses should implement this method")
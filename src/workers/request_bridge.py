@@ -0,0 +1,49 @@
+import asyncio
+import threading
+import uuid
+from typing import Any, Callable
+
+
+class RequestBridge:
+    """
+    Pairs requests sent to another worker (through Qt signals) with their
+    responses, keyed by request id. Requests are awaited on the caller's event
+    loop; resolve() may be called from any thread.
+    """
+
+    def __init__(self):
+        self._pending: dict[str, tuple[asyncio.AbstractEventLoop, asyncio.Future]] = {}
+        self._lock = threading.Lock()
+
+    async def request(self, send: Callable[[str], None], timeout: float | None = None) -> Any:
+        """
+        Calls send(request_id) and waits for the matching resolve().
+        Raises asyncio.TimeoutError if no response arrives in time.
+        """
+        loop = asyncio.get_running_loop()
+        request_id = uuid.uuid4().hex
+        future = loop.create_future()
+        with self._lock:
+            self._pending[request_id] = (loop, future)
+        try:
+            send(request_id)
+            return await asyncio.wait_for(future, timeout=timeout)
+        finally:
+            with self._lock:
+                self._pending.pop(request_id, None)
+
+    def resolve(self, request_id: str, value: Any):
+        with self._lock:
+            entry = self._pending.pop(request_id, None)
+        if entry is None:
+            return
+        loop, future = entry
+        loop.call_soon_threadsafe(_set_result, future, value)
+
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+
+def _set_result(future: asyncio.Future, value: Any):
+    if not future.done():
+        future.set_result(value)
@@ -1,14 +1,18 @@
 import asyncio
-import threading
+from functools import partial
 from typing import Literal
 from PyQt6.QtCore import pyqtSignal, pyqtSlot
 
 import settings
 from src.autotel import BatteriesAlert, LongRides
 from src.goto import LateAlert
-import time
+from src.shared import http_client, resilience, deadline, tracing, metrics, BaseAlert
+from src.shared.data_hub import DataHub
+from src.shared.token_manager import XTokenManager
 from ..app.common.config import cfg
+from .alert_scheduler import AlertScheduler
 from .base_worker import BaseWorker
+from .request_bridge import RequestBridge
 
 class WebAutomationWorker(BaseWorker):
     toast_signal = pyqtSignal(str, str, str)
@@ -17,20 +21,23 @@ class WebAutomationWorker(BaseWorker):
     batteries_table_row = pyqtSignal(object)
     long_rides_table_row = pyqtSignal(object)
     request_delete_table = pyqtSignal()
+    api_status_changed = pyqtSignal(str, str)
 
     open_url_requested = pyqtSignal(str)
-    request_pointer_location = pyqtSignal(str)
-    request_x_token = pyqtSignal(str)
+    request_pointer_location = pyqtSignal(str, object)
+    request_x_token = pyqtSignal(str, str)
 
     def __init__(self,  parent=None):
         super(WebAutomationWorker, self).__init__(parent)
+        self.scheduler: AlertScheduler | None = None
+        self.alerts: dict[str, BaseAlert] = {}
 
-        self._location_condition = threading.Condition()
-        self._location_response = None
+        self._location_bridge = RequestBridge()
 
-        self._x_token_condition = threading.Condition()
-        self._goto_x_token = None
-        self._autotel_x_token = None
+        self._x_token_bridge = RequestBridge()
+        self.tokens = XTokenManager(self.request_x_token_async)
+        self.hub = DataHub(self.tokens)
+        resilience.add_state_listener(self.api_status_changed.emit)
     
     async def _async_main(self):
         self.request_delete_table.emit()
@@ -40,39 +47,47 @@ class WebAutomationWorker(BaseWorker):
             return
 
         late, batteries_alert, long_rides_alert = self._init_alerts()
-        last_run = 0
+        self.alerts = {
+            name: alert for name, alert in
+            (('late_rides', late), ('long_rides', long_rides_alert), ('batteries', batteries_alert))
+            if alert is not None
+        }
+        self.scheduler = AlertScheduler()
+        for name, alert in self.alerts.items():
+            schedule = settings.alert_schedules[name]
+            self.scheduler.add(name, partial(self._run_alert, alert, schedule['interval']), **schedule)
+        scheduler_task = asyncio.create_task(self.scheduler.run())
+        self._register_metrics()
 
         while self.running:
-            now = time.time()
-            if now - last_run >= settings.tasks_interval:
-                last_run = now
-                await self._run_alert_requests(late, batteries_alert, long_rides_alert)
-            timeout = max(1, settings.tasks_interval - (now - last_run))
-            await self.wait_by(timeout=timeout)
-                    
-        
-    def request_x_token_sync(self, mode: Literal['goto', 'autotel']) -> object:
-        """Emit signal and wait for location data."""
-        if mode == 'goto':
-            self._goto_x_token = None
-        elif mode == 'autotel':
-            self._autotel_x_token = None
-        with self._x_token_condition:
-            self.request_x_token.emit(mode)
-            if not self._x_token_condition.wait(timeout=70):
-                return
-        
-        return self._goto_x_token if mode == 'goto' else self._autotel_x_token
+            await self.wait_by(timeout=settings.tasks_interval)
+
+        self.scheduler.stop()
+        await scheduler_task
+
+    def refresh_alert(self, name: str):
+        """Refresh one alert ('late_rides', 'long_rides' or 'batteries') now. Safe to call from the GUI thread."""
+        if self.loop and self.scheduler:
+            self.loop.call_soon_threadsafe(self.scheduler.trigger, name)
         
-    def request_pointer_location_sync(self, car_license: str) -> object:
-        """Emit signal and wait for location data."""
-        self._location_response = None
-
-        with self._location_condition:
-            self.request_pointer_location.emit(car_license)
-            if not self._location_condition.wait(timeout=30):
-                return None
-            return self._location_response
+    async def request_x_token_async(self, mode: Literal['goto', 'autotel']) -> str | None:
+        """Ask WebDataWorker for the service's X-Token and await its answer."""
+        return await self._x_token_bridge.request(
+            lambda request_id: self.request_x_token.emit(request_id, mode),
+            timeout=settings.x_token_request_timeout,
+        )
+
+    @tracing.traced(category='pointer')
+    async def get_pointer_locations(self, car_licenses: list[str]) -> dict[str, str]:
+        """Resolve a list of licence plates in a single round trip to WebDataWorker."""
+        try:
+            return await self._location_bridge.request(
+                lambda request_id: self.request_pointer_location.emit(request_id, list(car_licenses)),
+                timeout=deadline.timeout_for(settings.pointer_request_timeout),
+            )
+        except asyncio.TimeoutError:
+            print(f"Pointer location request timed out for {len(car_licenses)} plates")
+            return {}
             
     def _init_alerts(self):
         late = None
@@ -83,51 +98,68 @@ class WebAutomationWorker(BaseWorker):
                 show_toast=self.toast_signal.emit,
                 gui_table_row=self.late_table_row.emit,
                 open_ride=self.open_url_requested,
-                x_token_request=self.request_x_token_sync,
+                hub=self.hub,
             )
     
         if cfg.get(cfg.batteries):
             batteries_alert = BatteriesAlert(
                 show_toast=self.toast_signal.emit,
                 gui_table_row=self.batteries_table_row.emit,
-                pointer=self.request_pointer_location_sync,
+                pointer=self.get_pointer_locations,
                 open_ride=self.open_url_requested,
-                x_token_request=self.request_x_token_sync
+                hub=self.hub
             )
         if cfg.get(cfg.long_rides):
             long_rides_alert = LongRides(
                 show_toast=self.toast_signal.emit,
                 gui_table_row=self.long_rides_table_row.emit,
-                pointer=self.request_pointer_location_sync,
+                pointer=self.get_pointer_locations,
                 open_ride=self.open_url_requested,
-                x_token_request=self.request_x_token_sync
+                hub=self.hub
             )
         
         return late, batteries_alert, long_rides_alert
 
-    async def _run_alert_requests(self, late, batteries_alert, long_rides_alert):
-        tasks = []
-        if late is not None:
-            tasks.append(asyncio.create_task(late.start_requests(self._goto_x_token)))
-        if long_rides_alert is not None:
-            tasks.append(asyncio.create_task(long_rides_alert.start_requests(self._autotel_x_token)))
-        if batteries_alert is not None:
-            tasks.append(asyncio.create_task(batteries_alert.start_requests(self._autotel_x_token)))
-        if tasks:
-            await asyncio.gather(*tasks)
-    
-    def set_x_token_data(self, mode, data):
-        """Receives location data from WebDataWorker."""
-        with self._x_token_condition:
-            if mode == 'goto':
-                self._goto_x_token = data
-            elif mode == 'autotel':
-                self._autotel_x_token = data
-            self._x_token_condition.notify()
+    def _register_metrics(self):
+        """Expose the stats kept by the alerts, scheduler, HTTP pool and caches in the metrics registry."""
+        pool = http_client.get_pool()
+        for name, alert in self.alerts.items():
+            metrics.register_collector(f"alert.{name}", lambda alert=alert, name=name: {
+                **alert.stats, **{f"schedule_{key}": value for key, value in self.scheduler.jobs[name].stats.items()}
+            })
+        metrics.register_collector('http_pool', lambda: {
+            **pool.stats, 'reuse_ratio': pool.reuse_ratio(), **{f"coalesced_{key}": value for key, value in pool.inflight.stats.items()}
+        })
+        metrics.register_collector('rate_limits', lambda: {
+            f"{host}.{key}": value for host, limiter in list(pool.limiters.items()) for key, value in limiter.snapshot().items()
+        })
+        metrics.register_collector('data_hub', lambda: dict(self.hub.stats))
+        metrics.register_collector('x_tokens', lambda: dict(self.tokens.stats))
+        metrics.register_collector('comment_cache', lambda: {
+            **BaseAlert.comment_cache.stats, 'hit_rate': BaseAlert.comment_cache.hit_rate(), 'size': len(BaseAlert.comment_cache)
+        })
+        metrics.register_collector('request_bridges', lambda: {
+            'pointer_pending': self._location_bridge.pending_count(), 'x_token_pending': self._x_token_bridge.pending_count()
+        })
+
+    async def _run_alert(self, alert: BaseAlert, interval: float):
+        """Run one alert, cancelling it if it is still running at its cycle deadline."""
+        with deadline.cycle_deadline(min(settings.cycle_deadline, interval)), \
+                tracing.span(f"{type(alert).__name__} cycle", 'alert'), \
+                metrics.histogram('alert_cycle_seconds', 'Alert cycle duration').time(alert=type(alert).__name__):
+            try:
+                await asyncio.wait_for(alert.start_requests(), timeout=deadline.remaining())
+            except asyncio.TimeoutError:
+                if not deadline.expired():
+                    raise
+                alert.stats['deadline_misses'] += 1
+                print(f"{type(alert).__name__} missed the cycle deadline")
+                alert.publish_stale()
+
+    def set_x_token_data(self, request_id, mode, data):
+        """Receives X-Token data from WebDataWorker."""
+        self._x_token_bridge.resolve(request_id, data)
             
-    def set_location_data(self, data):
+    def set_location_data(self, request_id, data):
         """Receives location data from WebDataWorker."""
-        with self._location_condition:
-            self._location_response = data
-            self._location_condition.notify()
-            
\ No newline at end of file
+        self._location_bridge.resolve(request_id, data)
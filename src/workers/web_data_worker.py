@@ -5,7 +5,7 @@ from PyQt6.QtCore import pyqtSignal
 from playwright.async_api import Request, Page
 from services import AsyncWebAccess
 import settings
-from src.shared import PointerLocation, utils
+from src.shared import PointerLocation, utils, tracing, metrics
 import time
 import asyncio
 
@@ -20,16 +20,17 @@ from typing import Literal, Union
 
 @dataclass
 class WebTask:
-    mode: Literal["url", "pointer", "x_token", "cookies"]
-    payload: Union[str, int, Literal['goto', 'autotel']]
+    mode: Literal["url", "pointer", "pointer_batch", "x_token", "cookies"]
+    payload: Union[str, int, list[str], Literal['goto', 'autotel']]
+    request_id: str | None = None
     
 class WebDataWorker(BaseWorker):
     page_loaded = pyqtSignal()
     notification_send = pyqtSignal(str, object)
 
     request_otp_input = pyqtSignal()
-    pointer_location_send = pyqtSignal(object)
-    x_token_send = pyqtSignal(str, str)
+    pointer_location_send = pyqtSignal(str, object)
+    x_token_send = pyqtSignal(str, str, object)
     input_received = pyqtSignal()
     cookies_send = pyqtSignal(str, str)
     
@@ -39,10 +40,13 @@ class WebDataWorker(BaseWorker):
         self.task_queue = Queue()
         self.pointer_lock = asyncio.Lock()
         self.pointer = None
+        metrics.register_collector('web_data_worker', lambda: {
+            'queue_depth': self.task_queue.qsize(), 'pointer_locked': self.pointer_lock.locked()
+        })
 
  
     async def _async_main(self):
-        async with AsyncWebAccess(False, 'edge', 'Port') as self.web_access:
+        async with AsyncWebAccess(False, 'edge', 'Port', blocked_urls=settings.blocked_url_patterns) as self.web_access:
             await self._init_pages()
             
             asyncio.create_task(self._handle_pointer_login()) if cfg.get(cfg.pointer) else self.page_loaded.emit()
@@ -60,10 +64,25 @@ class WebDataWorker(BaseWorker):
                     asyncio.create_task(self.reload_pointer_data())
                 await self.wait_by(timeout=3)
 
+    @tracing.traced(category='web_data')
     @utils.async_retry(allow_falsy=True)
     async def reload_pointer_data(self):
         async with self.pointer_lock:
-            await self.web_access.pages["pointer"].reload()
+            if self.pointer:
+                self.pointer.begin_reload()
+            try:
+                await self.web_access.pages["pointer"].reload()
+                if self.pointer and self.pointer.network_locations:
+                    print(f"Pointer fleet data: {len(self.pointer.network_locations)} plates from the network")
+                elif self.pointer:
+                    try:
+                        print(f"Pointer snapshot: {await self.pointer.refresh_snapshot()} plates")
+                    except Exception as e:
+                        # Lookups retry the snapshot, then fall back to the DOM
+                        print(f"Pointer snapshot failed: {type(e).__name__}: {e}")
+            finally:
+                if self.pointer:
+                    self.pointer.end_reload()
 
     @utils.async_retry(allow_falsy=True)
     async def update_page_data(self):
@@ -129,15 +148,16 @@ class WebDataWorker(BaseWorker):
             while not self.task_queue.empty() and self.running:
                 task: WebTask = self.task_queue.get_nowait()
                 if task.mode == "url":
-                    tasks.append(asyncio.create_task(self._handle_open_url_request(task.payload)))
-                elif task.mode == "pointer":
-                    tasks.append(asyncio.create_task(self._handle_pointer_location_request(str(task.payload))))
+                    tasks.append(asyncio.create_task(self._timed(task, self._handle_open_url_request(task.payload))))
+                elif task.mode in ("pointer", "pointer_batch"):
+                    car_licenses = list(task.payload) if task.mode == "pointer_batch" else [str(task.payload)]
+                    tasks.append(asyncio.create_task(self._timed(task, self._handle_pointer_location_request(task.request_id, car_licenses))))
                 elif task.mode == "x_token":
                     if isinstance(task.payload, str) and task.payload in ('goto', 'autotel'):
-                        tasks.append(asyncio.create_task(self._handle_x_token_request(task.payload)))
+                        tasks.append(asyncio.create_task(self._timed(task, self._handle_x_token_request(task.request_id, task.payload))))
                 elif task.mode == "cookies":
                     if isinstance(task.payload, str) and task.payload in ('goto', 'autotel'):
-                        tasks.append(asyncio.create_task(self.handle_cookies_request(task.payload)))
+                        tasks.append(asyncio.create_task(self._timed(task, self.handle_cookies_request(task.payload))))
 
             results = await asyncio.gather(*tasks, return_exceptions=True)
             for result in results:
@@ -151,6 +171,11 @@ class WebDataWorker(BaseWorker):
             if tasks:
                 await asyncio.gather(*tasks, return_exceptions=True)
             
+    async def _timed(self, task: WebTask, handler):
+        with metrics.histogram('browser_task_seconds', 'WebDataWorker task duration').time(task=task.mode):
+            return await handler
+
+    @tracing.traced(category='web_data')
     async def handle_cookies_request(self, mode: Literal['goto', 'autotel']):
         try:
             if mode == 'goto':
@@ -164,6 +189,7 @@ class WebDataWorker(BaseWorker):
         except Exception as e:
             print(f"Error getting cookies: {e}")
             
+    @tracing.traced(category='web_data')
     async def _handle_open_url_request(self, url):
         try:
             self.bring_window_to_front('Work - ')
@@ -197,7 +223,8 @@ class WebDataWorker(BaseWorker):
         win32gui.EnumWindows(enumHandler, None)
         
                     
-    async def _handle_x_token_request(self, mode: Literal['goto', 'autotel']):
+    @tracing.traced(category='web_data')
+    async def _handle_x_token_request(self, request_id: str, mode: Literal['goto', 'autotel']):
         try:
             if mode == 'goto':
                 request_page = await self.find_page("goto_bo", settings.goto_url)
@@ -206,9 +233,9 @@ class WebDataWorker(BaseWorker):
             else:
                 return
             x_token = await self.get_x_token_from_request(request_page)
-            self.x_token_send.emit(mode, x_token)
+            self.x_token_send.emit(request_id, mode, x_token)
         except Exception:
-            self.x_token_send.emit(mode, None)
+            self.x_token_send.emit(request_id, mode, None)
 
     async def find_page(self, name, url) -> Page:
         if name in self.web_access.pages and not self.web_access.pages[name].is_closed:
@@ -218,15 +245,27 @@ class WebDataWorker(BaseWorker):
                 return page
         return await self.web_access.create_new_page(name, url, open_mode='reuse')
     
-    async def _handle_pointer_location_request(self, car_license: str):
-        async with self.pointer_lock:
-            if not self.pointer:
-                return
-            try:
-                data = await self.pointer.search_location(car_license)
-                self.pointer_location_send.emit(data.strip("").strip(","))
-            except Exception:
-                self.pointer_location_send.emit("Error: Manually reload Pointer")
+    @tracing.traced(category='web_data')
+    async def _handle_pointer_location_request(self, request_id: str, car_licenses: list[str]):
+        locations = {}
+        missing = []
+        if self.pointer:
+            # Answered without pointer_lock, so lookups don't wait on a reload
+            for car_license in car_licenses:
+                if (cached := self.pointer.peek(car_license)) is not None:
+                    locations[car_license] = cached
+                elif self.pointer.reloading:
+                    locations[car_license] = "Unknown Location (Pointer reloading)"
+                else:
+                    missing.append(car_license)
+        if missing:
+            async with self.pointer_lock:
+                try:
+                    found = await self.pointer.search_locations(missing)
+                    locations.update({car_license: data.strip().strip(",") for car_license, data in found.items()})
+                except Exception:
+                    locations.update({car_license: "Error: Manually reload Pointer" for car_license in missing})
+        self.pointer_location_send.emit(request_id, locations)
                 
     def enqueue_url(self, url: str):
         """Enqueue a URL to be opened in the web access context."""
@@ -234,10 +273,10 @@ class WebDataWorker(BaseWorker):
         self.task_queue.put(task)
         self.stop_event.set()
         
-    def enqueue_x_token(self, mode: Literal['goto', 'autotel']):
-        """Enqueue a pointer location request."""
+    def enqueue_x_token(self, request_id: str, mode: Literal['goto', 'autotel']):
+        """Enqueue an X-Token request."""
         print(f"Enqueuing x_token request for mode: {mode}")
-        task = WebTask(mode="x_token", payload=mode)
+        task = WebTask(mode="x_token", payload=mode, request_id=request_id)
         self.task_queue.put(task)
         self.stop_event.set()
         
@@ -247,15 +286,21 @@ class WebDataWorker(BaseWorker):
         self.task_queue.put(task)
         self.stop_event.set()
 
-    def enqueue_pointer_location(self, car_license: str):
-        """Enqueue a pointer location request."""
-        task = WebTask(mode="pointer", payload=car_license)
+    def enqueue_pointer_location(self, request_id: str, car_licenses: list[str]):
+        """Enqueue a pointer location request; several plates go as one "pointer_batch" task."""
+        if len(car_licenses) == 1:
+            task = WebTask(mode="pointer", payload=car_licenses[0], request_id=request_id)
+        else:
+            task = WebTask(mode="pointer_batch", payload=list(car_licenses), request_id=request_id)
         self.task_queue.put(task)
         self.stop_event.set()
         
     async def _handle_pointer_login(self):
         async with self.pointer_lock:
             self.pointer = PointerLocation(self.web_access)
+            metrics.register_collector('pointer', lambda: {
+                **self.pointer.stats, 'snapshot_plates': len(self.pointer.locations), 'network_plates': len(self.pointer.network_locations)
+            })
             if 'login' in self.web_access.pages['pointer'].url:
                 await self.pointer.login(cfg.get(cfg.pointer_user), cfg.get(cfg.phone))
             while self.running:
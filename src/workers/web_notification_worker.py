@@ -6,7 +6,7 @@ import uuid
 
 import httpx
 import settings
-from src.shared import utils
+from src.shared import utils, http_client
 from src.workers.base_worker import BaseWorker
 from PyQt6.QtCore import pyqtSignal, pyqtSlot
 import traceback
@@ -147,10 +147,9 @@ class WebNotificationWorker(BaseWorker):
 
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(url, headers=headers, content=BATCH_BODY.encode())
-                response.raise_for_status()
-                return response.text
+            response = await http_client.get_pool().post(url, headers=headers, content=BATCH_BODY.encode())
+            response.raise_for_status()
+            return response.text
         except httpx.HTTPStatusError as e:
             print(f"HTTP error: {e.response.status_code} - {e.response}")
         except Exception as e:
@@ -0,0 +1,58 @@
+import asyncio
+
+from src.workers.alert_scheduler import AlertScheduler
+
+
+def run_scheduler(setup, seconds: float):
+    async def main():
+        scheduler = AlertScheduler()
+        setup(scheduler)
+        runner = asyncio.ensure_future(scheduler.run())
+        await asyncio.sleep(seconds)
+        scheduler.stop()
+        await runner
+        return scheduler
+
+    return asyncio.run(main())
+
+
+def test_skip_drops_ticks_while_running():
+    async def slow():
+        await asyncio.sleep(0.25)
+
+    scheduler = run_scheduler(lambda s: s.add('job', slow, interval=0.05, overrun='skip'), 0.3)
+    stats = scheduler.jobs['job'].stats
+    assert stats['runs'] == 2
+    assert stats['skipped'] >= 3 and stats['coalesced'] == 0
+
+
+def test_coalesce_runs_once_more_after_overrun():
+    async def slow():
+        await asyncio.sleep(0.2)
+
+    scheduler = run_scheduler(lambda s: s.add('job', slow, interval=0.05, overrun='coalesce'), 0.3)
+    stats = scheduler.jobs['job'].stats
+    assert stats['runs'] == 2
+    assert stats['coalesced'] >= 2
+
+
+def test_trigger_runs_a_job_early():
+    runs = []
+
+    async def job():
+        runs.append(1)
+
+    def setup(scheduler):
+        scheduler.add('job', job, interval=60)
+        asyncio.get_running_loop().call_later(0.05, scheduler.trigger, 'job')
+
+    run_scheduler(setup, 0.1)
+    assert len(runs) == 2
+
+
+def test_failing_job_keeps_its_schedule():
+    async def fail():
+        raise ValueError("boom")
+
+    scheduler = run_scheduler(lambda s: s.add('job', fail, interval=0.05), 0.18)
+    assert scheduler.jobs['job'].stats['runs'] >= 3
@@ -0,0 +1,52 @@
+import asyncio
+
+from src.shared import BaseAlert
+
+
+def make_alert() -> BaseAlert:
+    return BaseAlert(show_toast=None, gui_table_row=None, open_ride=None, hub=None)
+
+
+def test_unchanged_payload_reuses_rows():
+    alert = make_alert()
+    rows = alert.remember('fingerprint', [['1', 'row']])
+    assert alert.reuse_previous('fingerprint') is rows
+    assert alert.reuse_previous('other') is None
+
+
+def test_degraded_rows_are_not_reused():
+    alert = make_alert()
+    alert.mark_degraded()
+    alert.remember('fingerprint', [['1', 'Error: TimeoutError']])
+    assert alert.reuse_previous('fingerprint') is None
+
+    alert.remember('fingerprint', [['1', 'row']])
+    assert alert.reuse_previous('fingerprint') == [['1', 'row']]
+
+
+def test_fallback_locations_mark_rows_degraded():
+    alert = make_alert()
+    alert.check_locations(['1234567'], {'1234567': 'Tel Aviv'})
+    assert not alert._degraded
+    alert.check_locations(['1234567', '7654321'], {'1234567': 'Tel Aviv'})
+    assert alert._degraded
+    alert._degraded = False
+    alert.check_locations(['1234567'], {'1234567': 'Tel Aviv (stale)'})
+    assert alert._degraded
+
+
+def test_failed_comment_refresh_is_handled(capsys):
+    class FailingAlert(BaseAlert):
+        async def fetch_ride_comment(self, ride_id, service_name):
+            raise RuntimeError("API down")
+
+    async def main():
+        alert = FailingAlert(show_toast=None, gui_table_row=None, open_ride=None, hub=None)
+        alert._refresh_comment(('goto', '1'), '1', 'goto')
+        task = BaseAlert._comment_refreshes[('goto', '1')]
+        await task
+        assert task.exception() is None
+        assert ('goto', '1') not in BaseAlert._comment_refreshes
+
+    asyncio.run(main())
+    assert "RuntimeError: API down" in capsys.readouterr().out
@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+from src.shared import utils
+from src.shared.data_hub import DataHub
+from src.shared.resilience import Failure
+from src.shared.token_manager import TokenUnavailableError, XTokenManager
+
+
+class FakeApi:
+    """ Answers fetch_data calls from a list of canned responses, recording the tokens used """
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.tokens = []
+
+    async def fetch_data(self, url, x_token, payload):
+        self.tokens.append(x_token)
+        return self.responses.pop(0)
+
+
+def make_hub(monkeypatch, api: FakeApi) -> tuple[DataHub, list]:
+    fetched = []
+
+    async def fetch_token(service):
+        fetched.append(service)
+        return f"token-{len(fetched)}"
+
+    monkeypatch.setattr(utils, 'fetch_data', api.fetch_data)
+    return DataHub(XTokenManager(fetch_token)), fetched
+
+
+def test_missing_token_fails_before_sending(monkeypatch):
+    api = FakeApi()
+
+    async def no_token(service):
+        return None
+
+    monkeypatch.setattr(utils, 'fetch_data', api.fetch_data)
+    hub = DataHub(XTokenManager(no_token))
+    with pytest.raises(TokenUnavailableError):
+        asyncio.run(hub.fetch('goto', 'getCurrentReservations'))
+    assert not api.tokens
+
+
+def test_server_error_is_returned_without_a_token_refresh(monkeypatch):
+    failure = Failure(RuntimeError("500 Internal Server Error"))
+    api = FakeApi(failure)
+    hub, fetched = make_hub(monkeypatch, api)
+
+    assert asyncio.run(hub.fetch('goto', 'getCurrentReservations')) is failure
+    assert fetched == ['goto'] and api.tokens == ['token-1']
+
+
+@pytest.mark.parametrize('rejection', [Failure(RuntimeError("401"), reason='unauthorized'), {'Data': ''}])
+def test_rejected_token_is_refreshed_once(monkeypatch, rejection):
+    api = FakeApi(rejection, {'Data': '[]'})
+    hub, fetched = make_hub(monkeypatch, api)
+
+    assert asyncio.run(hub.fetch('goto', 'getCurrentReservations')) == {'Data': '[]'}
+    assert fetched == ['goto', 'goto'] and api.tokens == ['token-1', 'token-2']
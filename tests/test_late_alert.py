@@ -0,0 +1,64 @@
+import asyncio
+import time
+from datetime import datetime as dt, timedelta
+
+from src.goto import LateAlert
+from src.shared import BaseAlert
+from src.shared.data_hub import Snapshot
+from src.shared.records import FutureReservation, Reservation
+
+
+class FakeHub:
+    """ Serves fixed snapshots; comments come back as the ride ID """
+
+    def __init__(self, current, future):
+        self.snapshots = {'getCurrentReservations': current, 'GetFutureReservations': future}
+        self.reservations = 0
+
+    async def snapshot(self, service, opcode):
+        return self.snapshots[opcode]
+
+    async def reservation(self, service, ride_id):
+        self.reservations += 1
+        return {'comment': f"comment {ride_id}"}
+
+
+def snapshot(opcode, records, fingerprint):
+    return Snapshot('goto', opcode, tuple(records), fingerprint, time.monotonic())
+
+
+def make_alert(future_records, future_fingerprint='future-1'):
+    late = Reservation(1, '12-345-67', 'A', 'B', None, dt.now() - timedelta(minutes=5), None)
+    hub = FakeHub(
+        snapshot('getCurrentReservations', [late], 'current-1'),
+        snapshot('GetFutureReservations', future_records, future_fingerprint),
+    )
+    BaseAlert.comment_cache.clear()
+    return LateAlert(show_toast=None, gui_table_row=None, open_ride=None, hub=hub), hub
+
+
+def test_unchanged_payloads_reuse_rows():
+    alert, hub = make_alert([])
+    first = asyncio.run(alert.fetch_late_rides())
+    assert asyncio.run(alert.fetch_late_rides()) is first
+    assert alert.stats['reused'] == 1
+
+
+def test_new_future_booking_rebuilds_rows():
+    alert, hub = make_alert([])
+    assert asyncio.run(alert.fetch_late_rides())[0][2] == "No future ride"
+
+    booking = FutureReservation(2, '12-345-67', dt.now() + timedelta(hours=1))
+    hub.snapshots['GetFutureReservations'] = snapshot('GetFutureReservations', [booking], 'future-2')
+    assert asyncio.run(alert.fetch_late_rides())[0][2] == 2
+    assert alert.stats['reused'] == 0
+
+
+def test_opening_a_ride_rebuilds_rows():
+    alert, hub = make_alert([])
+    asyncio.run(alert.fetch_late_rides())
+    alert.open_ride = type('Signal', (), {'emit': lambda self, url: None})()
+    alert.build_open_ride(1, 'goto', 'https://example.test')()
+    asyncio.run(alert.fetch_late_rides())
+    assert alert.stats['reused'] == 0
+    assert hub.reservations == 2
@@ -0,0 +1,96 @@
+import json
+
+from src.shared.pointer_parsing import extract_locations, index_rows, is_plate, normalize_plate, plate_column
+
+LOCATION_COLUMN = 12
+
+
+def table_row(plate: str, location: str, **cells) -> list[str]:
+    """ A row of the Pointer car table: plate in column 1, location in LOCATION_COLUMN """
+    row = ['', plate, 'Toyota Corolla', 'פעיל', '12:04 18/10', '054-1234567', '2021', '', '', '', '', '', location]
+    for column, text in cells.items():
+        row[int(column.lstrip('c'))] = text
+    return row
+
+
+def test_normalize_plate_drops_separators():
+    assert normalize_plate('12-345-67') == '1234567'
+    assert normalize_plate(' 123 45 678 ') == '12345678'
+    assert normalize_plate('AB-12') == 'AB12'
+    assert normalize_plate(None) == ''
+
+
+def test_is_plate():
+    assert is_plate('12-345-67') and is_plate('12345') and is_plate('123-45-678')
+    assert not is_plate('1234') and not is_plate('123456789')
+    assert not is_plate('AB-123-45') and not is_plate('') and not is_plate('תל אביב')
+    assert not is_plate('12:04 18/10') and not is_plate('18/10/2026') and not is_plate('1,234.56')
+
+
+def test_extract_locations_from_wrapped_asp_net_payload():
+    cars = [
+        {'CarNumber': '12-345-67', 'LastAddress': ' דיזנגוף 50, תל אביב ', 'Speed': 0},
+        {'carNumber': '8765432', 'lastAddress': 'הרצל 1, חיפה'},
+    ]
+    payload = {'d': json.dumps({'Result': {'Cars': cars, 'Count': 2}})}
+    assert extract_locations(payload) == {'1234567': 'דיזנגוף 50, תל אביב', '8765432': 'הרצל 1, חיפה'}
+
+
+def test_extract_locations_prefers_the_first_listed_field():
+    car = {'Plate': '1111111', 'LicensePlate': '22-222-22', 'Location': 'B', 'Address': 'A'}
+    assert extract_locations([car]) == {'2222222': 'A'}
+
+
+def test_extract_locations_ignores_unrecognised_payloads():
+    assert extract_locations({'d': '[not json'}) == {}
+    assert extract_locations({'Users': [{'Name': 'x', 'Phone': '0541234567'}]}) == {}
+    assert extract_locations({'CarNumber': '1234567', 'Location': {'Lat': 32.1, 'Lng': 34.8}}) == {}
+    assert extract_locations(None) == {}
+
+
+def test_index_rows_reads_only_the_plate_column():
+    rows = [
+        table_row('12-345-67', 'דיזנגוף 50'),
+        table_row('23-456-78', 'הרצל 1', c2='5550123'),  # a model cell that happens to be digits
+        table_row('345-67-890', 'אבן גבירול 10'),
+    ]
+    assert plate_column(rows, LOCATION_COLUMN) == 1
+    assert index_rows(rows, LOCATION_COLUMN) == {
+        '1234567': 'דיזנגוף 50',
+        '2345678': 'הרצל 1',
+        '34567890': 'אבן גבירול 10',
+    }
+
+
+def test_index_rows_skips_rows_without_a_plate_or_location():
+    rows = [
+        table_row('12-345-67', 'דיזנגוף 50'),
+        table_row('', 'הרצל 1'),
+        table_row('טרם שובץ', 'אבן גבירול 10'),
+        ['', '7654321', 'short row'],
+    ]
+    assert index_rows(rows, LOCATION_COLUMN) == {'1234567': 'דיזנגוף 50'}
+
+
+def test_index_rows_keeps_the_first_row_of_a_plate():
+    rows = [table_row('1234567', 'first'), table_row('12-345-67', 'second')]
+    assert index_rows(rows, LOCATION_COLUMN) == {'1234567': 'first'}
+
+
+def test_plate_column_found_wherever_the_table_puts_it():
+    rows = [table_row('', f'loc {i}', c3=f'{i}0-123-45') for i in range(1, 4)]
+    assert plate_column(rows, LOCATION_COLUMN) == 3
+    assert index_rows(rows, LOCATION_COLUMN) == {'1012345': 'loc 1', '2012345': 'loc 2', '3012345': 'loc 3'}
+
+
+def test_plate_column_ties_go_to_the_leftmost_column():
+    rows = [table_row('1234567', 'a', c6='99999'), table_row('7654321', 'b', c6='88888')]
+    assert plate_column(rows, LOCATION_COLUMN) == 1
+    rows.append(table_row('', 'c', c6='77777'))
+    assert plate_column(rows, LOCATION_COLUMN) == 6
+
+
+def test_empty_table():
+    assert plate_column([], LOCATION_COLUMN) is None
+    assert index_rows([], LOCATION_COLUMN) == {}
+    assert index_rows([table_row('', 'x')], LOCATION_COLUMN) == {}
@@ -0,0 +1,49 @@
+import asyncio
+
+from src.shared.rate_limit import HostLimiter
+
+
+def test_in_flight_cap_queues_callers():
+    limiter = HostLimiter(rate=1000, burst=1000, max_in_flight=2)
+
+    async def main():
+        await limiter.acquire()
+        await limiter.acquire()
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0.01)
+        assert not waiter.done() and limiter.queue_depth == 1
+        limiter.release(overloaded=False)
+        await asyncio.wait_for(waiter, 1)
+        assert limiter.in_flight == 2
+
+    asyncio.run(main())
+
+
+def test_overload_halves_and_health_recovers():
+    limiter = HostLimiter(rate=10, burst=100, max_in_flight=8)
+
+    async def cycle(overloaded: bool):
+        await limiter.acquire()
+        limiter.release(overloaded)
+
+    asyncio.run(cycle(True))
+    assert limiter.rate == 5 and limiter.limit == 4
+    for _ in range(40):
+        asyncio.run(cycle(False))
+    assert limiter.rate == 10 and limiter.limit == 8
+
+
+def test_cancelled_waiter_passes_its_slot_on():
+    limiter = HostLimiter(rate=1000, burst=1000, max_in_flight=1)
+
+    async def main():
+        await limiter.acquire()
+        first = asyncio.ensure_future(limiter.acquire())
+        second = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0.01)
+        limiter.release(overloaded=False)
+        first.cancel()
+        await asyncio.wait_for(second, 1)
+        assert limiter.in_flight == 1
+
+    asyncio.run(main())
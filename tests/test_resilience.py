@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from src.shared import deadline, resilience, utils
+
+
+class FakePool:
+    """ Stands in for HttpClientPool: post() runs the given coroutine function """
+
+    def __init__(self, post):
+        self.post = post
+
+
+def half_open_breaker(endpoint: str) -> resilience.CircuitBreaker:
+    breaker = resilience.CircuitBreaker(endpoint, failure_threshold=1, reset_timeout=0.01)
+    resilience._breakers[endpoint] = breaker
+    breaker.record_failure()
+    breaker.opened_at -= 1
+    assert breaker.allow() and breaker.state == 'half_open'
+    breaker.release_trial()
+    return breaker
+
+
+def test_breaker_opens_and_lets_one_trial_through():
+    breaker = resilience.CircuitBreaker('breaker.test', failure_threshold=2, reset_timeout=60)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == 'open' and not breaker.allow()
+
+    breaker.opened_at -= 60
+    assert breaker.allow() and breaker.state == 'half_open'
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == 'closed' and breaker.allow()
+
+
+def test_cancelled_trial_releases_the_breaker():
+    endpoint = 'cancelled.test'
+    breaker = half_open_breaker(endpoint)
+
+    async def hang(url, **kwargs):
+        await asyncio.sleep(60)
+
+    async def main():
+        task = asyncio.ensure_future(utils._post_json(FakePool(hang), f"https://{endpoint}/API", 'token', {}))
+        await asyncio.sleep(0)
+        assert breaker._trial_in_flight
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    assert breaker.state == 'half_open' and breaker.failures == 1
+    assert breaker.allow()
+
+
+def test_deadline_trial_releases_the_breaker_without_a_failure():
+    endpoint = 'deadline.test'
+    breaker = half_open_breaker(endpoint)
+
+    async def past_deadline(url, **kwargs):
+        raise deadline.DeadlineExceeded("Cycle deadline passed")
+
+    result = asyncio.run(utils._post_json(FakePool(past_deadline), f"https://{endpoint}/API", 'token', {}))
+    assert result.reason == 'deadline'
+    assert breaker.state == 'half_open' and breaker.failures == 1
+    assert breaker.allow()
@@ -0,0 +1,105 @@
+import random
+
+from src.shared.row_diff import RowDiffer, cell_key, row_keys
+
+
+def callback():
+    pass
+
+
+def test_row_keys_number_duplicate_ids():
+    rows = [['1', 'a'], ['2', 'b'], ['1', 'c'], [('1', callback), 'd']]
+    assert row_keys(rows) == (('1', 0), ('2', 0), ('1', 1), ('1', 2))
+
+
+def test_cell_key_compares_buttons_by_label():
+    assert cell_key(('123', callback)) == cell_key(('123', lambda: None)) == ('button', '123')
+    assert cell_key(None) == ('text', '')
+    assert cell_key(5) == ('text', '5')
+
+
+def test_first_diff_adds_every_row():
+    delta = RowDiffer().diff([['1', 'a'], ['2', 'b']])
+    assert delta.previous == ()
+    assert list(delta.added) == [('1', 0), ('2', 0)]
+    assert not delta.updated and not delta.removed and not delta.reordered
+
+
+def test_added_updated_and_removed():
+    differ = RowDiffer()
+    differ.diff([['1', 'a', 'x'], ['2', 'b', 'y'], ['3', 'c', 'z']])
+    delta = differ.diff([['1', 'a', 'x'], ['3', 'c', 'changed'], ['4', 'd', 'w']])
+    assert delta.added == {('4', 0): ['4', 'd', 'w']}
+    assert delta.updated == {('3', 0): {2: 'changed'}}
+    assert delta.removed == (('2', 0),)
+    assert not delta.reordered
+
+
+def test_identical_rows_are_unchanged():
+    differ = RowDiffer()
+    differ.diff([['1', 'a'], [('2', callback), 'b']])
+    delta = differ.diff([['1', 'a'], [('2', lambda: None), 'b']])
+    assert delta.unchanged
+
+
+def test_swapped_rows_are_reordered():
+    differ = RowDiffer()
+    differ.diff([['1', 'a'], ['2', 'b'], ['3', 'c']])
+    delta = differ.diff([['2', 'b'], ['1', 'a'], ['3', 'c']])
+    assert delta.reordered
+    assert not delta.added and not delta.removed
+
+
+def test_insertions_alone_are_not_a_reorder():
+    differ = RowDiffer()
+    differ.diff([['1', 'a'], ['3', 'c']])
+    delta = differ.diff([['0', 'z'], ['1', 'a'], ['2', 'b'], ['3', 'c']])
+    assert not delta.reordered
+    assert list(delta.added) == [('0', 0), ('2', 0)]
+
+
+def test_duplicate_ids_diff_by_occurrence():
+    differ = RowDiffer()
+    differ.diff([['1', 'first'], ['1', 'second']])
+    delta = differ.diff([['1', 'first'], ['1', 'changed'], ['1', 'third']])
+    assert delta.updated == {('1', 1): {1: 'changed'}}
+    assert delta.added == {('1', 2): ['1', 'third']}
+
+    delta = differ.diff([['1', 'first']])
+    assert delta.removed == (('1', 1), ('1', 2))
+
+
+def test_row_length_change_updates_every_cell():
+    differ = RowDiffer()
+    differ.diff([['No late rides', '0', '0']])
+    delta = differ.diff([['No late rides', '0', '0', 'extra']])
+    assert delta.updated == {('No late rides', 0): {0: 'No late rides', 1: '0', 2: '0', 3: 'extra'}}
+
+
+def apply(table: list[list], keys: list, delta) -> tuple[list[list], list]:
+    """ Applies a delta the way TableFrame.applyDelta does, falling back to a rebuild """
+    if delta.reordered or keys != list(delta.previous):
+        return [list(row) for row in delta.rows], list(delta.keys)
+    for key in delta.removed:
+        index = keys.index(key)
+        del table[index], keys[index]
+    positions = {key: i for i, key in enumerate(keys)}
+    for key, cells in delta.updated.items():
+        for column, value in cells.items():
+            row = table[positions[key]]
+            row.extend([None] * (column + 1 - len(row)))
+            row[column] = value
+    for i, key in enumerate(delta.keys):
+        if key in delta.added:
+            table.insert(i, list(delta.added[key]))
+    return table, list(delta.keys)
+
+
+def test_deltas_rebuild_the_same_table():
+    rng = random.Random(7)
+    differ = RowDiffer()
+    table, keys = [], []
+    for _ in range(500):
+        rows = [[str(rng.randint(1, 8)), str(rng.randint(1, 3))] for _ in range(rng.randint(0, 8))]
+        table, keys = apply(table, keys, differ.diff(rows))
+        assert [[cell_key(cell)[1] for cell in row] for row in table] == rows
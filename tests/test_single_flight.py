@@ -0,0 +1,53 @@
+import asyncio
+
+from src.shared.single_flight import SingleFlight
+
+
+def test_concurrent_calls_share_one_run():
+    flight = SingleFlight()
+    runs = []
+
+    async def work():
+        runs.append(1)
+        await asyncio.sleep(0.01)
+        return 'result'
+
+    async def main():
+        return await asyncio.gather(*(flight.do('key', work) for _ in range(3)))
+
+    assert asyncio.run(main()) == ['result'] * 3
+    assert len(runs) == 1
+    assert flight.stats == {'calls': 3, 'shared': 2}
+
+
+def test_errors_reach_every_caller():
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def main():
+        return await asyncio.gather(flight.do('key', fail), flight.do('key', fail), return_exceptions=True)
+
+    assert all(isinstance(result, ValueError) for result in asyncio.run(main()))
+
+
+def test_cancelled_leader_does_not_cancel_followers():
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.05)
+        return 'result'
+
+    async def main():
+        leader = asyncio.ensure_future(flight.do('key', work))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.do('key', work))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        assert await follower == 'result'
+        assert leader.cancelled()
+        assert not flight._inflight
+
+    asyncio.run(main())
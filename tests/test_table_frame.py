@@ -0,0 +1,63 @@
+import os
+import random
+
+import pytest
+
+pytest.importorskip('PyQt6')
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+from services.fluent.qfluentwidgets import PushButton, SubtitleLabel  # noqa: E402
+from src.app.view.table_frame import TableFrame  # noqa: E402
+from src.shared.row_diff import RowDiffer, cell_key  # noqa: E402
+
+
+@pytest.fixture(scope='module')
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def table(app):
+    return TableFrame(['Ride', 'Value'], SubtitleLabel('Rides'))
+
+
+def contents(table: TableFrame) -> list[list[str]]:
+    rows = []
+    for i in range(table.rowCount()):
+        row = []
+        for column in range(table.columnCount()):
+            widget = table.cellWidget(i, column)
+            button = widget.findChild(PushButton) if widget else None
+            item = table.item(i, column)
+            row.append(button.text() if button else item.text() if item else '')
+        rows.append(row)
+    return rows
+
+
+def test_placeholder_swap_keeps_keys_in_sync(table, monkeypatch):
+    table.setRows([['No late rides', '0']])
+    table.setRows([['Goto API error', '-']])  # same layout, so only the text is replaced
+    assert table._keys == [('Goto API error', 0)]
+
+    differ = RowDiffer()
+    differ.diff([['Goto API error', '-']])
+
+    rebuilds = []
+    monkeypatch.setattr(table, 'setRows', lambda rows: rebuilds.append(rows))
+    table.applyDelta(differ.diff([['Goto API error', 'timeout']]))
+    assert not rebuilds
+    assert contents(table) == [['Goto API error', 'timeout']]
+
+
+def test_deltas_match_a_full_rebuild(table):
+    rng = random.Random(3)
+    differ = RowDiffer()
+    for _ in range(200):
+        rows = []
+        for _ in range(rng.randint(0, 6)):
+            ride_id = str(rng.randint(1, 6))
+            rows.append([(ride_id, lambda: None) if rng.random() < 0.5 else ride_id, str(rng.randint(1, 3))])
+        table.applyDelta(differ.diff(rows))
+        assert contents(table) == [[cell_key(cell)[1] for cell in row] for row in rows]
@@ -0,0 +1,76 @@
+import asyncio
+
+import settings
+from src.shared.token_manager import XTokenManager
+
+
+class FakeBrowser:
+    """ Hands out numbered tokens, like WebDataWorker reading them from the browser """
+
+    def __init__(self, delay: float = 0):
+        self.fetches = 0
+        self.delay = delay
+
+    async def fetch_token(self, service):
+        self.fetches += 1
+        await asyncio.sleep(self.delay)
+        return f"{service}-{self.fetches}"
+
+
+def test_get_caches_the_token():
+    browser = FakeBrowser()
+    tokens = XTokenManager(browser.fetch_token)
+
+    async def main():
+        return [await tokens.get('goto') for _ in range(3)]
+
+    assert asyncio.run(main()) == ['goto-1'] * 3
+    assert browser.fetches == 1
+
+
+def test_concurrent_refreshes_share_one_fetch():
+    browser = FakeBrowser(delay=0.01)
+    tokens = XTokenManager(browser.fetch_token)
+
+    async def main():
+        return await asyncio.gather(*(tokens.refresh('goto') for _ in range(5)))
+
+    assert asyncio.run(main()) == ['goto-1'] * 5
+    assert browser.fetches == 1
+
+
+def test_rejected_young_token_does_not_set_a_lifetime(monkeypatch):
+    monkeypatch.setattr(settings, 'x_token_refresh_margin', 60)
+    browser = FakeBrowser()
+    tokens = XTokenManager(browser.fetch_token)
+
+    async def main():
+        rejected = await tokens.get('goto')
+        await tokens.refresh('goto', rejected=rejected)
+        for _ in range(6):
+            await tokens.get('goto')
+            await asyncio.sleep(0)
+
+    asyncio.run(main())
+    assert browser.fetches == 2
+    assert tokens.stats['proactive_refreshes'] == 0
+
+
+def test_rejected_token_lifetime_triggers_proactive_refresh(monkeypatch):
+    monkeypatch.setattr(settings, 'x_token_refresh_margin', 60)
+    browser = FakeBrowser()
+    tokens = XTokenManager(browser.fetch_token)
+
+    async def main():
+        rejected = await tokens.get('goto')
+        tokens._tokens['goto'].obtained_at -= 600
+        await tokens.refresh('goto', rejected=rejected)
+        assert tokens._lifetimes['goto'] >= 600
+
+        tokens._tokens['goto'].obtained_at -= 550
+        await tokens.get('goto')
+        await asyncio.sleep(0.01)
+
+    asyncio.run(main())
+    assert browser.fetches == 3
+    assert tokens.stats['proactive_refreshes'] == 1
@@ -0,0 +1,27 @@
+import asyncio
+
+from src.shared import tracing
+
+
+def test_finished_tasks_hand_back_their_rows(monkeypatch):
+    monkeypatch.setattr(tracing, '_trace_file', 'unused.json')
+    monkeypatch.setattr(tracing, '_tracks', {})
+    monkeypatch.setattr(tracing, '_free_tracks', {})
+    tracing._events.clear()
+
+    async def row():
+        with tracing.span('row'):
+            await asyncio.sleep(0)
+
+    async def main():
+        for _ in range(20):
+            await asyncio.gather(*(row() for _ in range(5)))
+            await asyncio.sleep(0)
+
+    asyncio.run(main())
+    spans = [event for event in tracing._events if event['ph'] == 'X']
+    rows = [event for event in tracing._events if event['ph'] == 'M']
+    assert len(spans) == 100
+    assert len({event['tid'] for event in spans}) == 5
+    assert len(rows) == 5
+    assert not tracing._tracks